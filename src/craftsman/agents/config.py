@@ -5,8 +5,10 @@ Defines different agent modes with their tools and permissions.
 
 import os
 import platform
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Any
 
@@ -18,10 +20,18 @@ from craftsman.tools.core import (
 # Get the prompts directory
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
+# Cache for prompt file contents, keyed by path.
+# Stores (mtime_ns, text) so edits to prompt files are still picked up,
+# while the common case (unchanged file) costs one stat() instead of a read.
+_PROMPT_CACHE: dict[Path, tuple[int, str]] = {}
+
 
 def load_prompt(agent_name: str) -> str:
     """Load system prompt from file.
-    
+
+    Prompt contents are cached per file and invalidated by mtime, so
+    repeated loads (reloads, tests) only re-read when the file changed.
+
     Args:
         agent_name: Name of the agent (e.g., "coder", "researcher")
 
@@ -33,9 +43,19 @@ def load_prompt(agent_name: str) -> str:
     """
 
     prompt_file = PROMPTS_DIR / f"{agent_name}.md"
-    if not prompt_file.exists():
-        raise FileNotFoundError(f"Prompt file not found: {prompt_file}")
-    return prompt_file.read_text().strip()
+
+    # Single stat() doubles as the existence check — no separate exists().
+    try:
+        st = prompt_file.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Prompt file not found: {prompt_file}") from None
+    entry = _PROMPT_CACHE.get(prompt_file)
+    if entry is not None and entry[0] == st.st_mtime_ns:
+        return entry[1]
+
+    text = prompt_file.read_text().strip()
+    _PROMPT_CACHE[prompt_file] = (st.st_mtime_ns, text)
+    return text
 
 
 def build_dynamic_context(agent_name: str, cwd: str | None = None) -> str:
@@ -117,45 +137,40 @@ class AgentConfig:
         return f"{context_block}\n\n{self.system_prompt}"
 
 
-CODER_PROMPT = load_prompt("coder")
-RESEARCHER_PROMPT = load_prompt("researcher")
-PLANNER_PROMPT = load_prompt("planner")
-REVIEWER_PROMPT = load_prompt("reviewer")
-
-
-# Agent configurations
-AGENT_CONFIGS: dict[str, AgentConfig] = {
-    "coder": AgentConfig(
+# Lazy agent builders — each AgentConfig (and its prompt file read) is only
+# constructed on first access, so importing this module costs no disk I/O.
+_AGENT_BUILDERS: dict[str, Callable[[], AgentConfig]] = {
+    "coder": lambda: AgentConfig(
         name="coder",
         description="Full-access coding agent for development work",
-        system_prompt=CODER_PROMPT,
+        system_prompt=load_prompt("coder"),
         tools=TOOLS,  # All tools
         mode="primary",
         max_steps=100,  # Coder gets more steps for complex tasks
         color="green",
     ),
-    "researcher": AgentConfig(
+    "researcher": lambda: AgentConfig(
         name="researcher",
         description="Read-only agent for exploring codebases",
-        system_prompt=RESEARCHER_PROMPT,
+        system_prompt=load_prompt("researcher"),
         tools=[read_file, grep, glob_files], # Read-only tools
         mode="subagent",
         max_steps=30, # Researcher should be quick
         color="cyan",
     ),
-    "planner": AgentConfig(
+    "planner": lambda: AgentConfig(
         name="planner",
         description="Planning agent that creates implementation plans",
-        system_prompt=PLANNER_PROMPT,
+        system_prompt=load_prompt("planner"),
         tools=[read_file, write_file, glob_files],  # Limited write access
         mode="subagent",
         max_steps=20,  # Planning should be focused
         color="yellow",
     ),
-    "reviewer": AgentConfig(
+    "reviewer": lambda: AgentConfig(
         name="reviewer",
         description="Code review specialist that analyzes code for bugs and improvements",
-        system_prompt=REVIEWER_PROMPT,
+        system_prompt=load_prompt("reviewer"),
         tools=[read_file, grep, glob_files],  # Read-only tools
         mode="subagent",
         max_steps=20,  # Review should be focused
@@ -164,20 +179,60 @@ AGENT_CONFIGS: dict[str, AgentConfig] = {
 }
 
 
+@lru_cache(maxsize=None)
 def get_agent_config(agent_name: str) -> AgentConfig:
     """Get configuration for a specific agent.
 
+    Configs are built lazily on first request and cached for the process
+    lifetime, so repeated lookups are dict-cheap.
+
     Args:
         agent_name: Name of the agent (coder, researcher, planner)
-    
+
     Returns:
         AgentConfig for the specified agent
-    
+
     Raises:
         ValueError: If agent not found
     """
-    if agent_name not in AGENT_CONFIGS:
-        available = ", ".join(AGENT_CONFIGS.keys())
+    builder = _AGENT_BUILDERS.get(agent_name)
+    if builder is None:
+        available = ", ".join(_AGENT_BUILDERS.keys())
         raise ValueError(f"Unknown agent: {agent_name}. Available: {available}")
-    return AGENT_CONFIGS[agent_name]
+    return builder()
+
+
+class _LazyAgentConfigs(Mapping):
+    """Dict-like view over the agent registry that materializes on demand.
+
+    Keeps the public AGENT_CONFIGS name working (membership tests, .keys(),
+    .items(), indexing) without paying the prompt-file reads at import time.
+    """
+
+    def __getitem__(self, name: str) -> AgentConfig:
+        if name not in _AGENT_BUILDERS:
+            raise KeyError(name)
+        return get_agent_config(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_AGENT_BUILDERS)
+
+    def __len__(self) -> int:
+        return len(_AGENT_BUILDERS)
+
+
+AGENT_CONFIGS: Mapping[str, AgentConfig] = _LazyAgentConfigs()
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily resolve the legacy *_PROMPT module constants (PEP 562)."""
+    prompts = {
+        "CODER_PROMPT": "coder",
+        "RESEARCHER_PROMPT": "researcher",
+        "PLANNER_PROMPT": "planner",
+        "REVIEWER_PROMPT": "reviewer",
+    }
+    if name in prompts:
+        return load_prompt(prompts[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -5,24 +5,111 @@ This implements the OpenCode pattern where the main coder agent
 can invoke specialized subagents with step limits.
 """
 
+import hashlib
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel, Field
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.checkpoint.sqlite import SqliteSaver
 
 from craftsman.agents.config import get_agent_config
 
+# langgraph is imported lazily in _get_or_create_subagent so that importing
+# craftsman.agents (e.g. for AGENT_CONFIGS) doesn't pull in the framework.
+
 
 # Cache for subagent instances.
-# Keyed by "{session_id}:{agent_name}" so each session gets its own
-# subagent graph instance with the correct persistent thread.
+# Keyed by "{session_id}:{agent_name}:{model_id}" so each session gets its
+# own subagent graph instance with the correct persistent thread, and a
+# mid-session model switch doesn't reuse a graph bound to the old model.
 _subagent_cache: dict[str, Any] = {}
 
 
+# LRU cache of delegation results, keyed by (session_id, agent_name, prompt).
+# A subagent invocation costs seconds of LLM latency; when the coder re-asks
+# the exact same question in the same session (common while re-planning),
+# return the prior answer instead of re-running the subagent. The cache is
+# only valid while the tree is unchanged — the graph invalidates it whenever
+# a mutating tool runs (see MUTATING_TOOLS).
+_DELEGATION_CACHE_SIZE = 64
+_delegation_cache: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+
+# Tools whose execution makes cached delegation results stale: a review or
+# research answer produced before a write no longer describes the tree.
+MUTATING_TOOLS = frozenset({"write_file", "edit_file", "run_bash"})
+
+
+def _agent_can_mutate(agent_name: str) -> bool:
+    """True when the agent's own toolset includes a mutating tool.
+
+    The planner holds write_file (for plan markdown), so its delegations
+    can change the tree just like a top-level write would.
+    """
+    return any(t.name in MUTATING_TOOLS for t in get_agent_config(agent_name).tools)
+
+
+def invalidate_delegation_cache(session_id: str | None = None) -> None:
+    """Drop cached delegation results (for one session, or all of them).
+
+    Called after a mutating tool executes — re-delegating the same prompt
+    must re-run the subagent against the current state of the tree instead
+    of returning the memoized pre-edit answer.
+    """
+    if session_id is None:
+        _delegation_cache.clear()
+        return
+    for key in [k for k in _delegation_cache if k[0] == session_id]:
+        del _delegation_cache[key]
+
+
+def _get_cached_delegation(session_id: str, agent_name: str, prompt: str) -> str | None:
+    """Return a cached delegation result for this session, if any."""
+    key = (session_id, agent_name, prompt)
+    result = _delegation_cache.get(key)
+    if result is not None:
+        _delegation_cache.move_to_end(key)
+    return result
+
+
+def _cache_delegation(session_id: str, agent_name: str, prompt: str, result: str) -> None:
+    """Remember a delegation result, evicting the oldest entry when full."""
+    _delegation_cache[(session_id, agent_name, prompt)] = result
+    if len(_delegation_cache) > _DELEGATION_CACHE_SIZE:
+        _delegation_cache.popitem(last=False)
+
+
+def _stable_tid(prefix: str, text: str) -> str:
+    """Derive a deterministic thread ID from text (BLAKE2b, not salted hash).
+
+    Identical inputs map to the same thread across process restarts, so the
+    checkpointer can resume prior state instead of recomputing.
+    """
+    return f"{prefix}-{hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()}"
+
+
+def _model_identity(model) -> str:
+    """Stable identity string for a model instance (for cache keying)."""
+    return getattr(model, "model_name", None) or getattr(model, "model", None) or repr(model)
+
+
+def warm_subagent_pool(
+    model,
+    cwd: str | None = None,
+    session_id: str = "default",
+    in_memory: bool = False,
+    db_path: Path | None = None,
+    agent_names: tuple[str, ...] = ("researcher", "planner", "reviewer"),
+) -> None:
+    """Pre-build subagent graphs so the first delegation pays no setup cost.
+
+    create_react_agent compiles a full StateGraph per call; warming the pool
+    moves that work to agent-build time instead of the first tool call.
+    """
+    for agent_name in agent_names:
+        _get_or_create_subagent(agent_name, model, cwd, session_id, in_memory, db_path)
+
+
 def _get_or_create_subagent(
     agent_name: str,
     model,
@@ -33,24 +120,20 @@ def _get_or_create_subagent(
 ):
     """Get or create a subagent instance for a given session.
 
-    Each subagent is scoped to a (session_id, agent_name) pair so that
-    delegations within the same session accumulate context across turns,
-    while different sessions remain isolated.
+    Each subagent is scoped to a (session_id, agent_name, model) triple so
+    that delegations within the same session accumulate context across turns,
+    while different sessions and models remain isolated.
     """
-    cache_key = f"{session_id}:{agent_name}"
+    cache_key = f"{session_id}:{agent_name}:{_model_identity(model)}"
     if cache_key not in _subagent_cache:
+        from langgraph.prebuilt import create_react_agent
+
         config = get_agent_config(agent_name)
 
-        if in_memory:
-            checkpointer = MemorySaver()
-        else:
-            # Re-use the same database as the main agent so all conversation
-            # history (parent + subagents) lives in one place.
-            from craftsman.graph.builder import DEFAULT_DB_PATH
-            resolved_db = db_path or DEFAULT_DB_PATH
-            resolved_db = Path(resolved_db)
-            resolved_db.parent.mkdir(parents=True, exist_ok=True)
-            checkpointer = SqliteSaver.from_conn_string(str(resolved_db))
+        # Re-use the same database (and pooled connection) as the main agent
+        # so all conversation history (parent + subagents) lives in one place.
+        from craftsman.graph.builder import get_checkpointer
+        checkpointer = get_checkpointer(db_path, in_memory)
 
         subagent = create_react_agent(
             model,
@@ -76,6 +159,20 @@ class DelegateToPlannerInput(BaseModel):
     )
 
 
+class DelegateToReviewerInput(BaseModel):
+    """Input for delegate_to_reviewer tool."""
+    code_or_file: str = Field(
+        description="Either a file path to review, or describe what to review"
+    )
+
+
+class DelegateToReviewerBatchInput(BaseModel):
+    """Input for delegate_to_reviewer_batch tool."""
+    items: list[str] = Field(
+        description="File paths or review descriptions to review in one batch"
+    )
+
+
 def create_subagent_tools(
     model,
     cwd: str | None = None,
@@ -96,8 +193,74 @@ def create_subagent_tools(
     Returns:
         List of delegation tools
     """
+    # Warm the pool up front: graph compilation happens at agent-build time
+    # instead of adding latency to the first delegation of the session.
+    warm_subagent_pool(model, cwd, session_id, in_memory, db_path)
+
+    def _invoke_config(agent_name: str, max_steps: int) -> dict:
+        # Stable thread ID: same session always continues the same
+        # subagent conversation rather than starting fresh. This is a plain
+        # deterministic string (never Python's salted hash()), so SqliteSaver
+        # checkpoints remain addressable across process restarts.
+        return {
+            "configurable": {"thread_id": f"{session_id}-{agent_name}"},
+            "recursion_limit": max_steps,
+        }
+
+    def _delegate(agent_name: str, cache_text: str, prompt_text: str, label: str) -> str:
+        """Run one delegation synchronously (cache-aware)."""
+        cached = _get_cached_delegation(session_id, agent_name, cache_text)
+        if cached is not None:
+            return cached
+
+        subagent, max_steps = _get_or_create_subagent(
+            agent_name, model, cwd, session_id, in_memory, db_path
+        )
+        result = subagent.invoke(
+            {"messages": [HumanMessage(content=prompt_text)]},
+            config=_invoke_config(agent_name, max_steps),
+        )
+        last_message = result["messages"][-1]
+        report = f"[{label} (max {max_steps} steps)]\n\n{last_message.content}"
+        # A mutating-capable subagent (the planner) may have written files
+        # during this run — earlier cached delegations are now stale.
+        if _agent_can_mutate(agent_name):
+            invalidate_delegation_cache(session_id)
+        _cache_delegation(session_id, agent_name, cache_text, report)
+        return report
+
+    async def _adelegate(agent_name: str, cache_text: str, prompt_text: str, label: str) -> str:
+        """Async twin of _delegate — lets LangGraph's async executor overlap
+        multiple delegations issued in the same turn, so total latency is
+        max(subagent latencies) instead of their sum."""
+        cached = _get_cached_delegation(session_id, agent_name, cache_text)
+        if cached is not None:
+            return cached
+
+        subagent, max_steps = _get_or_create_subagent(
+            agent_name, model, cwd, session_id, in_memory, db_path
+        )
+        result = await subagent.ainvoke(
+            {"messages": [HumanMessage(content=prompt_text)]},
+            config=_invoke_config(agent_name, max_steps),
+        )
+        last_message = result["messages"][-1]
+        report = f"[{label} (max {max_steps} steps)]\n\n{last_message.content}"
+        # Same staleness rule as the sync path: a planner run may have
+        # written files, invalidating earlier cached delegations.
+        if _agent_can_mutate(agent_name):
+            invalidate_delegation_cache(session_id)
+        _cache_delegation(session_id, agent_name, cache_text, report)
+        return report
+
+    def _reviewer_prompt(code_or_file: str) -> str:
+        return f"""Please review the following code/file and provide feedback:
+
+{code_or_file}
+
+Look for bugs, security issues, code smells, and improvement opportunities.
+Prioritize issues by severity (Critical > Warning > Suggestion)."""
 
-    @tool(args_schema=DelegateToResearcherInput)
     def delegate_to_researcher(question: str) -> str:
         """Delegate a research task to the researcher agent.
 
@@ -107,22 +270,11 @@ def create_subagent_tools(
         - Finding specific implementations
         - Understanding how something works
         """
-        subagent, max_steps = _get_or_create_subagent(
-            "researcher", model, cwd, session_id, in_memory, db_path
-        )
-        result = subagent.invoke(
-            {"messages": [HumanMessage(content=question)]},
-            config={
-                # Stable thread ID: same session always continues the same
-                # researcher conversation rather than starting fresh.
-                "configurable": {"thread_id": f"{session_id}-researcher"},
-                "recursion_limit": max_steps,
-            },
-        )
-        last_message = result["messages"][-1]
-        return f"[Researcher Agent Report (max {max_steps} steps)]\n\n{last_message.content}"
+        return _delegate("researcher", question, question, "Researcher Agent Report")
+
+    async def adelegate_to_researcher(question: str) -> str:
+        return await _adelegate("researcher", question, question, "Researcher Agent Report")
 
-    @tool(args_schema=DelegateToPlannerInput)
     def delegate_to_planner(task: str) -> str:
         """Delegate to the planner agent to create an implementation plan.
 
@@ -132,20 +284,15 @@ def create_subagent_tools(
         - Breaking down complex tasks
         - Documenting approach before coding
         """
-        subagent, max_steps = _get_or_create_subagent(
-            "planner", model, cwd, session_id, in_memory, db_path
+        return _delegate(
+            "planner", task, f"Create an implementation plan for: {task}", "Planner Agent Report"
         )
-        result = subagent.invoke(
-            {"messages": [HumanMessage(content=f"Create an implementation plan for: {task}")]},
-            config={
-                "configurable": {"thread_id": f"{session_id}-planner"},
-                "recursion_limit": max_steps,
-            },
+
+    async def adelegate_to_planner(task: str) -> str:
+        return await _adelegate(
+            "planner", task, f"Create an implementation plan for: {task}", "Planner Agent Report"
         )
-        last_message = result["messages"][-1]
-        return f"[Planner Agent Report (max {max_steps} steps)]\n\n{last_message.content}"
 
-    @tool
     def delegate_to_reviewer(code_or_file: str) -> str:
         """Delegate to the reviewer agent for code review.
 
@@ -154,29 +301,80 @@ def create_subagent_tools(
         - Getting feedback on code changes before committing
         - Finding bugs, security issues, and code smells
         - Getting improvement suggestions
-
-        Args:
-            code_or_file: Either a file path to review, or describe what to review
         """
-        subagent, max_steps = _get_or_create_subagent(
-            "reviewer", model, cwd, session_id, in_memory, db_path
+        return _delegate(
+            "reviewer", code_or_file, _reviewer_prompt(code_or_file), "Code Review Report"
         )
-        prompt = f"""Please review the following code/file and provide feedback:
 
-{code_or_file}
+    async def adelegate_to_reviewer(code_or_file: str) -> str:
+        return await _adelegate(
+            "reviewer", code_or_file, _reviewer_prompt(code_or_file), "Code Review Report"
+        )
 
-Look for bugs, security issues, code smells, and improvement opportunities.
-Prioritize issues by severity (Critical > Warning > Suggestion)."""
+    def delegate_to_reviewer_batch(items: list[str]) -> str:
+        """Review several files or code snippets in one batched call.
 
-        result = subagent.invoke(
-            {"messages": [HumanMessage(content=prompt)]},
-            config={
-                "configurable": {"thread_id": f"{session_id}-reviewer"},
+        Much faster than calling delegate_to_reviewer once per item: all
+        reviews share the reviewer's system prompt and run concurrently.
+        Use this when you have multiple files to review at once.
+        """
+        if not items:
+            return "No items to review."
+
+        subagent, max_steps = _get_or_create_subagent(
+            "reviewer", model, cwd, session_id, in_memory, db_path
+        )
+        inputs = [
+            {"messages": [HumanMessage(content=_reviewer_prompt(item))]}
+            for item in items
+        ]
+        configs = [
+            {
+                # Per-item deterministic threads: a re-review of the same
+                # item resumes its prior checkpoint instead of starting over.
+                "configurable": {"thread_id": _stable_tid(f"{session_id}-review", item)},
                 "recursion_limit": max_steps,
-            },
+                "max_concurrency": 4,
+            }
+            for item in items
+        ]
+        results = subagent.batch(inputs, config=configs)
+
+        sections = []
+        for item, result in zip(items, results):
+            content = result["messages"][-1].content
+            sections.append(f"## Review: {item}\n\n{content}")
+        return (
+            f"[Batched Code Review Report ({len(items)} items, max {max_steps} steps each)]\n\n"
+            + "\n\n---\n\n".join(sections)
         )
-        last_message = result["messages"][-1]
-        return f"[Code Review Report (max {max_steps} steps)]\n\n{last_message.content}"
 
-    return [delegate_to_researcher, delegate_to_planner, delegate_to_reviewer]
+    # Expose both sync and async implementations on each tool so the graph
+    # can run delegations concurrently when the model requests several in
+    # one turn, while sync callers keep working unchanged.
+    return [
+        StructuredTool.from_function(
+            func=delegate_to_researcher,
+            coroutine=adelegate_to_researcher,
+            name="delegate_to_researcher",
+            args_schema=DelegateToResearcherInput,
+        ),
+        StructuredTool.from_function(
+            func=delegate_to_planner,
+            coroutine=adelegate_to_planner,
+            name="delegate_to_planner",
+            args_schema=DelegateToPlannerInput,
+        ),
+        StructuredTool.from_function(
+            func=delegate_to_reviewer,
+            coroutine=adelegate_to_reviewer,
+            name="delegate_to_reviewer",
+            args_schema=DelegateToReviewerInput,
+        ),
+        StructuredTool.from_function(
+            func=delegate_to_reviewer_batch,
+            name="delegate_to_reviewer_batch",
+            args_schema=DelegateToReviewerBatchInput,
+        ),
+    ]
 
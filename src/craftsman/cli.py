@@ -18,7 +18,6 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich import box
-from langchain_core.messages import HumanMessage
 
 from craftsman.graph.builder import (
     build_agent,
@@ -28,6 +27,7 @@ from craftsman.graph.builder import (
 )
 from craftsman.graph.checkpoints import (
     list_checkpoints,
+    list_checkpoints_with_total,
     format_checkpoint_table,
     get_session_count,
 )
@@ -131,8 +131,10 @@ def _handle_slash_command(
         if no_persist:
             console.print("[yellow]Checkpoints disabled (no persistence)[/yellow]")
             return
-        checkpoints = list_checkpoints(DEFAULT_DB_PATH, session, limit=10)
+        checkpoints, total = list_checkpoints_with_total(DEFAULT_DB_PATH, session, limit=10)
         console.print(format_checkpoint_table(checkpoints))
+        if total > len(checkpoints):
+            console.print(f"[dim]Showing {len(checkpoints)} of {total} checkpoints[/dim]")
 
     elif cmd == "/restore":
         if no_persist:
@@ -197,9 +199,9 @@ def _handle_slash_command(
             console.print("[dim]No remembered approvals in this session[/dim]")
         else:
             console.print("[bold]Remembered Approvals:[/bold]")
-            for key, action in approvals.items():
+            for (tool, pattern), action in approvals.items():
                 icon = "allow" if action == PermissionAction.ALLOW else "deny"
-                console.print(f"  [{icon}] {key}: {action.value}")
+                console.print(f"  [{icon}] {tool}:{pattern}: {action.value}")
 
     elif cmd == "/clear":
         clear_session_approvals()
@@ -256,6 +258,8 @@ def _handle_slash_command(
 
 async def _stream_response(agent, user_input: str, config: dict):
     """Stream agent response with real-time output using Rich TUI."""
+    from langchain_core.messages import HumanMessage
+
     tui = get_tui()
     current_tool_id = None
     current_tool_name = None
@@ -12,6 +12,9 @@ from typing import Any
 try:
     import yaml
     HAS_YAML = True
+    # Prefer the libyaml C loader when PyYAML was built with it — same
+    # semantics as SafeLoader, roughly an order of magnitude faster.
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except ImportError:
     HAS_YAML = False
 
@@ -19,6 +22,24 @@ except ImportError:
 CONFIG_DIR = Path.home() / ".craftsman"
 CONFIG_FILE = CONFIG_DIR / "config.yaml"
 
+# Parsed config file cache: (mtime_ns, data). The YAML parse is skipped
+# entirely while the file on disk is unchanged.
+_config_file_cache: tuple[int, dict] | None = None
+
+
+def _read_config_data() -> dict:
+    """Read and parse the config file, using the mtime-keyed cache."""
+    global _config_file_cache
+
+    st = CONFIG_FILE.stat()
+    if _config_file_cache is not None and _config_file_cache[0] == st.st_mtime_ns:
+        return _config_file_cache[1]
+
+    with open(CONFIG_FILE, "r") as f:
+        data = yaml.load(f, Loader=_YAML_LOADER) or {}
+    _config_file_cache = (st.st_mtime_ns, data)
+    return data
+
 
 @dataclass
 class UserConfig:
@@ -44,9 +65,8 @@ class UserConfig:
             return cls()
         
         try:
-            with open(CONFIG_FILE, "r") as f:
-                data = yaml.safe_load(f) or {}
-            
+            data = _read_config_data()
+
             return cls(
                 model=data.get("model"),
                 agent=data.get("agent", "coder"),
@@ -88,9 +108,18 @@ class UserConfig:
             if self.hooks:
                 data["hooks"] = self.hooks
             
-            with open(CONFIG_FILE, "w") as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-            
+            serialized = yaml.dump(data, default_flow_style=False, sort_keys=False)
+
+            # Skip the write (and the mtime bump) when nothing changed —
+            # keeps the load cache warm and avoids needless disk churn.
+            try:
+                if CONFIG_FILE.read_text() == serialized:
+                    return True
+            except OSError:
+                pass
+
+            CONFIG_FILE.write_text(serialized)
+
             return True
         except Exception:
             return False
@@ -105,36 +134,15 @@ class UserConfig:
         Returns:
             Tuple of (success, message)
         """
-        valid_keys = {
-            "agent": ["coder", "researcher", "planner", "reviewer"],
-            "policy": ["ask", "auto", "yolo", "never"],
-            "advanced": ["true", "false"],
-            "model": None,  # Any string allowed
-            "session": None,
-            "no_persist": ["true", "false"],
-        }
+        setter = _CONFIG_SETTERS.get(key)
+        if setter is None:
+            return False, f"Unknown key: {key}. Valid keys: {', '.join(_CONFIG_SETTERS)}"
 
-        if key not in valid_keys:
-            return False, f"Unknown key: {key}. Valid keys: {', '.join(valid_keys.keys())}"
-
-        allowed = valid_keys[key]
+        allowed = _ALLOWED_VALUES.get(key)
         if allowed and value.lower() not in allowed:
             return False, f"Invalid value for {key}. Allowed: {', '.join(allowed)}"
 
-        # Set the value
-        if key == "model":
-            self.model = value if value else None
-        elif key == "agent":
-            self.agent = value.lower()
-        elif key == "policy":
-            self.policy = value.lower()
-        elif key == "advanced":
-            self.advanced = value.lower() == "true"
-        elif key == "session":
-            self.session = value
-        elif key == "no_persist":
-            self.no_persist = value.lower() == "true"
-
+        setter(self, value)
         return True, f"Set {key} = {value}"
     
     def to_display_dict(self) -> dict[str, str]:
@@ -150,6 +158,26 @@ class UserConfig:
         }
 
 
+# Setter dispatch for set_value — one callable per key beats an if/elif
+# chain and keeps the key list and the assignment logic in one place.
+_CONFIG_SETTERS: dict[str, Any] = {
+    "model": lambda c, v: setattr(c, "model", v if v else None),
+    "agent": lambda c, v: setattr(c, "agent", v.lower()),
+    "policy": lambda c, v: setattr(c, "policy", v.lower()),
+    "advanced": lambda c, v: setattr(c, "advanced", v.lower() == "true"),
+    "session": lambda c, v: setattr(c, "session", v),
+    "no_persist": lambda c, v: setattr(c, "no_persist", v.lower() == "true"),
+}
+
+# Value whitelists per key; keys absent here accept any string.
+_ALLOWED_VALUES: dict[str, list[str]] = {
+    "agent": ["coder", "researcher", "planner", "reviewer"],
+    "policy": ["ask", "auto", "yolo", "never"],
+    "advanced": ["true", "false"],
+    "no_persist": ["true", "false"],
+}
+
+
 def get_config() -> UserConfig:
     """Get the current user configuration."""
     return UserConfig.load()
\ No newline at end of file
@@ -8,18 +8,22 @@ Supports:
 
 from pathlib import Path
 
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.checkpoint.sqlite import SqliteSaver
-
 from craftsman.agents.config import get_agent_config, AGENT_CONFIGS
-from craftsman.llm import get_llm
+
+# langgraph / langchain imports are deferred into the functions that need
+# them: importing this module (e.g. for DEFAULT_DB_PATH or agent listing)
+# should not pay the full framework import cost.
 
 
 # Default paths
 DEFAULT_DB_DIR = Path.home() / ".craftsman"
 DEFAULT_DB_PATH = DEFAULT_DB_DIR / "sessions.db"
 
+# Process-wide SqliteSaver pool, keyed by resolved database path.
+# Opening a fresh sqlite connection (and re-running the saver's setup DDL)
+# per agent build is wasted work — every graph in this process can share one.
+_sqlite_saver_pool: dict[str, object] = {}
+
 
 def get_model(model_name: str | None = None):
     """Get the LLM model via OpenRouter.
@@ -31,6 +35,7 @@ def get_model(model_name: str | None = None):
     Returns:
         ChatOpenAI instance configured for OpenRouter
     """
+    from craftsman.llm import get_llm
     return get_llm(model_name)
 
 
@@ -48,15 +53,28 @@ def get_checkpointer(
         LangGraph checkpointer
     """
     if in_memory:
+        from langgraph.checkpoint.memory import MemorySaver
         return MemorySaver()
-    
+
     if db_path is None:
         db_path = DEFAULT_DB_PATH
-    
+
     db_path = Path(db_path)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    return SqliteSaver.from_conn_string(str(db_path))
+    key = str(db_path.resolve())
+
+    saver = _sqlite_saver_pool.get(key)
+    if saver is None:
+        import sqlite3
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False: the saver serializes access internally,
+        # and tool/graph execution may hop between worker threads.
+        conn = sqlite3.connect(key, check_same_thread=False)
+        saver = SqliteSaver(conn)
+        _sqlite_saver_pool[key] = saver
+
+    return saver
 
 
 def build_agent(
@@ -79,6 +97,8 @@ def build_agent(
     Returns:
         Compiled LangGraph agent
     """
+    from langgraph.prebuilt import create_react_agent
+
     # Get agent configuration
     agent_config = get_agent_config(agent_name)
 
@@ -4,12 +4,21 @@ Provides functions to list and restore checkpoints from LangGraph's
 SqliteSaver checkpointer. Enables "save point" functionality.
 """
 
+import io
 import json
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
 
+# Prefer orjson for decoding checkpoint blobs — it parses straight from
+# bytes and is several times faster than the stdlib. Fall back gracefully.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 @dataclass
 class CheckpointInfo:
@@ -19,6 +28,22 @@ class CheckpointInfo:
     timestamp: str
     step: int
 
+
+def _ensure_index(conn: sqlite3.Connection) -> None:
+    """Create the composite index used by the session queries, if missing.
+
+    LangGraph's SqliteSaver only indexes its primary key, so the
+    thread_id + thread_ts DESC lookups here would otherwise scan. Best
+    effort: the table may not exist yet on a fresh database.
+    """
+    try:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_checkpoints_thread_ts "
+            "ON checkpoints (thread_id, thread_ts DESC)"
+        )
+    except sqlite3.Error:
+        pass
+
 def list_checkpoints(
     db_path: Path,
     thread_id: str,
@@ -39,6 +64,7 @@ def list_checkpoints(
     
     try:
         conn = sqlite3.connect(str(db_path))
+        _ensure_index(conn)
         cursor = conn.cursor()
 
         # LangGraph's SqliteSaver stores checkpoints in 'checkpoints' table
@@ -58,7 +84,9 @@ def list_checkpoints(
             checkpoints.append(CheckpointInfo(
                 checkpoint_id=thread_ts,
                 thread_id=tid,
-                timestamp=_format_timestamp(thread_ts),
+                # LangGraph uses UUIDs or timestamps as thread_ts; shorten
+                # long IDs inline — a slice per row, no call overhead.
+                timestamp=thread_ts[:8] + "..." if len(thread_ts) > 20 else thread_ts,
                 step=idx
             ))
         
@@ -68,6 +96,54 @@ def list_checkpoints(
         return []
 
 
+def list_checkpoints_with_total(
+    db_path: Path,
+    thread_id: str,
+    limit: int = 20,
+) -> tuple[list[CheckpointInfo], int]:
+    """List checkpoints for a session along with the session's total count.
+
+    Callers that want both the recent checkpoints and the overall count
+    previously needed list_checkpoints + get_session_count — two
+    connections and a full GROUP BY over every session. A COUNT(*) window
+    over the filtered rows answers both in one pass.
+
+    Returns:
+        Tuple of (checkpoints most recent first, total checkpoint count)
+    """
+    if not db_path.exists():
+        return [], 0
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+        _ensure_index(conn)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT thread_ts, thread_id, COUNT(*) OVER () AS total
+            FROM checkpoints
+            WHERE thread_id = ?
+            ORDER BY thread_ts DESC
+            LIMIT ?
+        """, (thread_id, limit)
+        )
+
+        checkpoints = []
+        total = 0
+        for idx, (thread_ts, tid, total) in enumerate(cursor.fetchall()):
+            checkpoints.append(CheckpointInfo(
+                checkpoint_id=thread_ts,
+                thread_id=tid,
+                timestamp=thread_ts[:8] + "..." if len(thread_ts) > 20 else thread_ts,
+                step=idx
+            ))
+
+        conn.close()
+        return checkpoints, total
+    except Exception:
+        return [], 0
+
+
 def get_latest_checkpoint(db_path: Path, thread_id: str) -> str | None:
     """Get the latest checkpoint ID for a session.
 
@@ -90,6 +166,7 @@ def get_session_count(db_path: Path) -> dict[str, int]:
     
     try:
         conn = sqlite3.connect(str(db_path))
+        _ensure_index(conn)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -106,35 +183,25 @@ def get_session_count(db_path: Path) -> dict[str, int]:
         return {}
     
 
-def _format_timestamp(thread_ts: str) -> str:
-    """Format a LangGraph thread_ts into human-readable format."""
-    try:
-        # LangGraph uses UUIDs or timestamps as thread_ts
-        # If it's a UUID, just return a shortened version
-        if len(thread_ts) > 20:
-            return thread_ts[:8] + "..."
-        return thread_ts
-    except Exception:
-        return thread_ts
-    
-
 def format_checkpoint_table(checkpoints: list[CheckpointInfo]) -> str:
     """Format checkpoints as a text table for display."""
     if not checkpoints:
         return "No checkpoints found for this session."
     
-    lines = ["Session Checkpoints:", ""]
-    lines.append(f"{'#':<4} {'Checkpoint ID':<40} {'Thread ID':<15}")
-    lines.append("-" * 60)
-    
+    buf = io.StringIO()
+    buf.write("Session Checkpoints:\n\n")
+    buf.write("#".ljust(4) + " " + "Checkpoint ID".ljust(40) + " " + "Thread ID".ljust(15) + "\n")
+    buf.write("-" * 60 + "\n")
+
+    # str.ljust is a direct C-level pad — cheaper per row than routing
+    # each field through the format-spec mini-language.
     for i, cp in enumerate(checkpoints):
         short_id = cp.checkpoint_id[:36] if len(cp.checkpoint_id) > 36 else cp.checkpoint_id
-        lines.append(f"{i:<4} {short_id:<40} {cp.thread_id:<15}")
-    
-    lines.append("")
-    lines.append("Use /restore <#> or /restore <checkpoint_id> to restore to a checkpoint.")
-    
-    return "\n".join(lines)
+        buf.write(str(i).ljust(4) + " " + short_id.ljust(40) + " " + cp.thread_id.ljust(15) + "\n")
+
+    buf.write("\nUse /restore <#> or /restore <checkpoint_id> to restore to a checkpoint.")
+
+    return buf.getvalue()
 
 
 def export_session(
@@ -163,6 +230,7 @@ def export_session(
     
     try:
         conn = sqlite3.connect(str(db_path))
+        _ensure_index(conn)
         cursor = conn.cursor()
 
         # Get checkpoint blobs with messages
@@ -174,43 +242,35 @@ def export_session(
             ORDER BY thread_ts ASC
             """, (thread_id,))
         
-        rows = cursor.fetchall()
-        conn.close()
-
-        if not rows:
-            return False, f"No conversation found for session '{thread_id}'."
-        
-        # Build markdown content
-        lines = [
-            f"# Agent CLI Session: {thread_id}",
-            "",
-            f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            f"**Agent:** {agent}",
-            "",
-            "---",
-            "",
-        ]
-
-        # Parse checkpoint blobs to extract messages
-        
-
+        # Build markdown content into a single buffer — appending to a big
+        # list and joining at the end doubles the peak memory for large
+        # sessions; StringIO grows one copy of the text.
+        buf = io.StringIO()
+        buf.write(f"# Agent CLI Session: {thread_id}\n\n")
+        buf.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+        buf.write(f"**Agent:** {agent}\n\n---\n\n")
+
+        # Parse checkpoint blobs to extract messages, streaming rows off the
+        # cursor one at a time instead of materializing them all up front.
         message_count = 0
+        row_count = 0
 
-        for checkpoint_blob, _ in rows:
+        for checkpoint_blob, _ in cursor:
+            row_count += 1
             try:
-                # Checkpoints are stored as JSON or pickle
-                # Try to decode as JSON first
-
-                if isinstance(checkpoint_blob, bytes):
+                # Checkpoints are stored as JSON or pickle.
+                # Decode in one pass — both orjson and json accept bytes
+                # and str directly, no intermediate .decode() needed.
+                if isinstance(checkpoint_blob, (bytes, str)):
                     try:
-                        checkpoint = json.loads(checkpoint_blob.decode('utf-8'))
-                    except:
+                        checkpoint = _json_loads(checkpoint_blob)
+                    except Exception:
                         # Skip binary pickled checkpoints
                         continue
                 else:
-                    checkpoint = json.loads(checkpoint_blob) if isinstance(checkpoint_blob, str) else checkpoint_blob
+                    checkpoint = checkpoint_blob
+
 
-                
                 # Extract messages from checkpoint state
                 if isinstance(checkpoint, dict):
                     channel_values = checkpoint.get('channel_values', {})
@@ -222,35 +282,27 @@ def export_session(
                             content = msg.get('content', '')
 
                             if role == 'human':
-                                lines.append("## User")
-                                lines.append("")
-                                lines.append(content)
-                                lines.append("")
-                                lines.append("---")
-                                lines.append("")
+                                buf.write(f"## User\n\n{content}\n\n---\n\n")
                                 message_count += 1
-                            
+
                             elif role == 'ai':
-                                lines.append("## Assistant")
-                                lines.append("")
-                                lines.append(content if content else "(tool call)")
-                                lines.append("")
-                                lines.append("---")
-                                lines.append("")
-                                message_count += 1         
+                                buf.write(f"## Assistant\n\n{content if content else '(tool call)'}\n\n---\n\n")
+                                message_count += 1
             except Exception:
                 continue
-        
+
+        conn.close()
+
+        if row_count == 0:
+            return False, f"No conversation found for session '{thread_id}'."
 
         if message_count == 0:
             # Fallback message
-            lines.append("*No messages could be extracted from checkpoints.*")
-            lines.append("")
-            lines.append(f"Session had {len(rows)} checkpoints.")
-        
+            buf.write("*No messages could be extracted from checkpoints.*\n\n")
+            buf.write(f"Session had {row_count} checkpoints.\n")
 
         # Write to file
-        output_path.write_text("\n".join(lines))
+        output_path.write_text(buf.getvalue())
 
         return True, str(output_path)
     
@@ -4,9 +4,20 @@ Summarizes old messages when approaching token limits.
 Based on OpenCode's compaction approach.
 """
 
+import hashlib
 import os
+import re
+import sys
+import weakref
 from typing import Any
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    AIMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
 
 
 # Fallback context limits — used when the live OpenRouter lookup fails.
@@ -46,6 +57,11 @@ RECENT_MESSAGES_TO_KEEP = 10     # Keep last N messages intact after compaction
 TOOL_OUTPUT_MAX_TOKENS = 4_000   # Max tokens per old tool output
 PROTECTED_RECENT_OUTPUTS = 3     # Don't prune last N tool outputs
 
+# Pieces of the truncation notice, hoisted so pruning concatenates three
+# constants and a number instead of rebuilding the format per output.
+_TRUNCATION_PREFIX = "\n\n[OUTPUT TRUNCATED - "
+_TRUNCATION_SUFFIX = " tokens removed]"
+
 # Runtime cache for live OpenRouter context limits.
 # Populated on first use per model; never re-queried in the same process.
 _live_context_cache: dict[str, int] = {}
@@ -92,8 +108,9 @@ def _fetch_live_context_limit(model_id: str) -> int | None:
 
     return None
 
-# Summary prompt for compaction
-SUMMARY_PROMPT = (
+# Summary prompt for compaction. Interned: the same string object is
+# reused across every compaction's SystemMessage.
+SUMMARY_PROMPT = sys.intern(
     "You are summarizing a coding assistant conversation to save context space. "
     "Create a concise summary (max 500 words) that preserves critical context:\n\n"
     "1. **Current Task**: What is the user trying to accomplish?\n"
@@ -149,20 +166,64 @@ def get_context_limit(model_name: str) -> int:
     # 5. Conservative default — unknown model, don't risk overflowing
     return DEFAULT_CONTEXT_LIMIT
 
+# Lazily constructed tiktoken encoder. get_encoding may need to fetch the
+# BPE file on first use, so failures of any kind (no tiktoken installed,
+# offline) fall back to the char//4 heuristic and are never retried.
+_token_encoder = None
+_token_encoder_failed = False
+
+
+def _get_token_encoder():
+    """Return the cached tiktoken encoder, or None if unavailable."""
+    global _token_encoder, _token_encoder_failed
+    if _token_encoder is None and not _token_encoder_failed:
+        try:
+            import tiktoken
+            _token_encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _token_encoder_failed = True
+    return _token_encoder
+
+
 def estimate_tokens(text: str) -> int:
-    """Rough token estimate (4 chars per token)."""
+    """Token estimate — exact via tiktoken when available, else chars/4."""
+    encoder = _get_token_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
     return len(text) // 4
 
 
+# Per-message token counts, keyed by message identity. BaseMessage isn't
+# hashable, so entries are keyed by id() and hold a weakref to the message;
+# the weakref callback evicts the entry when the message is collected, so
+# a recycled id() can never return another message's count. Message content
+# is immutable in practice (compaction builds new messages), so cached
+# counts never go stale.
+_message_token_cache: dict[int, tuple[weakref.ref, int]] = {}
+
+
 def estimate_message_tokens(message: BaseMessage) -> int:
-    """Estimate tokens in a message."""
+    """Estimate tokens in a message (cached per message object)."""
+    key = id(message)
+    cached = _message_token_cache.get(key)
+    if cached is not None:
+        return cached[1]
+
     content = message.content if isinstance(message.content, str) else str(message.content)
-    return estimate_tokens(content) + 10 # +10 for role overhead
+    count = estimate_tokens(content) + 10 # +10 for role overhead
+
+    try:
+        ref = weakref.ref(message, lambda _, key=key: _message_token_cache.pop(key, None))
+    except TypeError:
+        return count  # Not weakref-able; don't risk a stale id() entry
+    _message_token_cache[key] = (ref, count)
+    return count
 
 def estimate_total_tokens(messages: list[BaseMessage]) -> int:
     """Estimate total tokens in message list."""
     return sum(estimate_message_tokens(m) for m in messages)
 
+
 def should_compact(
         messages: list[BaseMessage],
         model_name: str | None = None,
@@ -187,8 +248,9 @@ def should_compact(
 
     usable_limit = context_limit - OUTPUT_RESERVE
     threshold = int(usable_limit * COMPACTION_THRESHOLD)
-    current_tokens = estimate_total_tokens(messages)
-    return current_tokens > threshold
+    # The per-message token cache makes this re-sum cheap: only messages
+    # added since the last check actually get encoded.
+    return estimate_total_tokens(messages) > threshold
 
 
 def prune_tool_outputs(
@@ -209,40 +271,205 @@ def prune_tool_outputs(
     Returns:
         Messages with old tool outputs truncated
     """
-    # Count tool messages from the end to identify protected ones
-    tool_message_indices = []
-    for i, msg in enumerate(messages):
+    # Single reverse pass: the first `protected_count` tool messages seen
+    # from the tail are the protected ones, so no index pre-scan is needed.
+    pruned_reversed: list[BaseMessage] = []
+    tool_messages_seen = 0
+    max_chars = max_token_per_output * 4 # ~4 chars per token
+
+    for msg in reversed(messages):
         if isinstance(msg, ToolMessage):
-            tool_message_indices.append(i)
-    
-    # Determine which indices are protected (last N tool messages)
-    protected_indices = set(tool_message_indices[-protected_count:]) if tool_message_indices else set()
-
-    # Process messages
-    pruned_messages = []
-    for i, msg in enumerate(messages):
-        if isinstance(msg, ToolMessage) and i not in protected_indices:
-            # This is an old tool output - check if it needs truncation
-            content = msg.content if isinstance(msg.content, str) else str(msg.content)
-            token_estimate = estimate_tokens(content)
-
-            if token_estimate > max_token_per_output:
-                # Truncate the output 
-                max_chars = max_token_per_output * 4 # ~4 chars per token
-                truncated_content = content[:max_chars]
-
-                # Create truncated message
-                pruned_msg = ToolMessage(
-                    content=f"{truncated_content}\n\n[OUTPUT TRUNCATED - {token_estimate - max_token_per_output} tokens removed]",
-                    tool_call_id=msg.tool_call_id,
-                )
-                pruned_messages.append(pruned_msg)
-            else:
-                pruned_messages.append(msg)
-        else:
-            pruned_messages.append(msg)
-    
-    return pruned_messages
+            tool_messages_seen += 1
+            if tool_messages_seen > protected_count:
+                # This is an old tool output - check if it needs truncation
+                content = msg.content if isinstance(msg.content, str) else str(msg.content)
+                token_estimate = estimate_tokens(content)
+
+                if token_estimate > max_token_per_output:
+                    # Truncate the output: one slice plus a concatenated
+                    # notice — no intermediate formatted copies of the body.
+                    # Keep the original id so the add_messages reducer
+                    # replaces the message instead of appending a duplicate.
+                    msg = ToolMessage(
+                        content=content[:max_chars]
+                        + _TRUNCATION_PREFIX
+                        + str(token_estimate - max_token_per_output)
+                        + _TRUNCATION_SUFFIX,
+                        tool_call_id=msg.tool_call_id,
+                        id=msg.id,
+                    )
+        pruned_reversed.append(msg)
+
+    pruned_reversed.reverse()
+    return pruned_reversed
+
+
+# Patterns preserved verbatim when masking a tool output: the agent keeps
+# needing exact file paths and error lines long after the full output is gone.
+_PATH_RE = re.compile(r"(?:~?/|\./)[\w@%+=:,.\-]+(?:/[\w@%+=:,.\-]+)*")
+_ERROR_LINE_RE = re.compile(r"^.*(?:Error|Exception|Traceback|FAILED).*$", re.MULTILINE)
+
+
+def _mask_observation(msg: ToolMessage) -> ToolMessage:
+    """Replace a tool output with a compact placeholder.
+
+    Keeps a content hash (so the agent can tell outputs apart), plus any
+    file paths and error lines extracted from the original — those are
+    the details the assistant's reasoning most often refers back to.
+    """
+    content = msg.content if isinstance(msg.content, str) else str(msg.content)
+    digest = hashlib.sha256(content.encode("utf-8", "replace")).hexdigest()[:8]
+
+    parts = [f"[tool output masked - {len(content)} chars, sha {digest}]"]
+    paths = list(dict.fromkeys(_PATH_RE.findall(content)))[:10]
+    if paths:
+        parts.append("paths: " + ", ".join(paths))
+    error_lines = _ERROR_LINE_RE.findall(content)[:3]
+    parts.extend(error_lines)
+
+    # Same id as the original so add_messages replaces it in place.
+    return ToolMessage(content="\n".join(parts), tool_call_id=msg.tool_call_id, id=msg.id)
+
+
+def mask_old_observations(
+        messages: list[BaseMessage],
+        protected_count: int = PROTECTED_RECENT_OUTPUTS,
+) -> list[BaseMessage]:
+    """Mask tool outputs older than the protected window.
+
+    Stronger than prune_tool_outputs: old outputs collapse to a short
+    placeholder instead of a truncated body, while the assistant messages
+    that reasoned about them stay verbatim.
+    """
+    masked_reversed: list[BaseMessage] = []
+    tool_messages_seen = 0
+
+    for msg in reversed(messages):
+        if isinstance(msg, ToolMessage):
+            tool_messages_seen += 1
+            if tool_messages_seen > protected_count and not (
+                isinstance(msg.content, str) and msg.content.startswith("[tool output masked")
+            ):
+                msg = _mask_observation(msg)
+        masked_reversed.append(msg)
+
+    masked_reversed.reverse()
+    return masked_reversed
+
+
+def _build_summary_request(old_messages: list[BaseMessage]) -> list[BaseMessage]:
+    """Assemble the LLM request that summarizes the old messages."""
+    return [
+        SystemMessage(content=SUMMARY_PROMPT),
+        *old_messages,
+        HumanMessage(content="Please summarize the above conversation.")
+    ]
+
+
+def _summary_result(
+        pruned: list[BaseMessage],
+        recent_messages: list[BaseMessage],
+        summary: str,
+) -> list[BaseMessage]:
+    """Build the summary-tier result as an add_messages-friendly delta.
+
+    The graph merges compact()'s return through the add_messages reducer,
+    which matches by message id — messages dropped by the summary must be
+    removed explicitly, and the kept recent ones re-added after the
+    summary message so ordering is preserved.
+    """
+    removals = [RemoveMessage(id=m.id) for m in pruned if m.id is not None]
+    # Re-add the recent messages under fresh ids: re-using the old ids
+    # would splice them back into their original positions, leaving the
+    # summary after them instead of before.
+    readds = [m.model_copy(update={"id": None}) for m in recent_messages]
+    return removals + [_wrap_summary(summary)] + readds
+
+
+# Marker prefixing a compaction summary. The graph's call_model checks
+# for it so the summary SystemMessage is never mistaken for the agent's
+# own system prompt.
+SUMMARY_MARKER = "[CONVERSATION SUMMARY]"
+
+
+def _wrap_summary(summary: str) -> SystemMessage:
+    """Wrap an LLM summary in the marker block the agent expects."""
+    return SystemMessage(
+        content=f"{SUMMARY_MARKER}\n{summary}\n[END SUMMARY]\n\n"
+                f"The above summarizes our earlier conversation. Recent messages follow:"
+    )
+
+
+def compact(
+        messages: list[BaseMessage],
+        llm,
+        model_name: str | None = None,
+        context_limit: int | None = None,
+) -> list[BaseMessage]:
+    """Tiered compaction: prune, then mask, and summarize only as a last resort.
+
+    Tier 1 truncates old tool outputs (free). Tier 2 collapses them to
+    placeholders that keep paths and error lines, preserving the
+    assistant's reasoning continuity. Tier 3 — an actual LLM
+    summarization call — only runs when the cheaper tiers didn't bring
+    the history back under the threshold; on tool-heavy traces this
+    skips a large share of summary calls.
+
+    Args:
+        messages: Message history (assumed over the compaction threshold)
+        llm: Model to use for summarization (invoked without tools)
+        model_name: Model name to get context limit for (optional)
+        context_limit: Override context limit (optional)
+
+    Returns:
+        Message delta for the add_messages reducer — pruned/masked
+        replacements, or removals plus summary + recent messages
+    """
+    pruned = prune_tool_outputs(messages)
+
+    # Tier 1 may already have freed enough space — no LLM call needed
+    if not should_compact(pruned, model_name=model_name, context_limit=context_limit):
+        return pruned
+
+    # Tier 2: mask old observations entirely, keeping recent ones verbatim
+    pruned = mask_old_observations(pruned)
+    if not should_compact(pruned, model_name=model_name, context_limit=context_limit):
+        return pruned
+
+    if len(pruned) <= RECENT_MESSAGES_TO_KEEP:
+        return pruned
+
+    old_messages = pruned[:-RECENT_MESSAGES_TO_KEEP]
+    recent_messages = pruned[-RECENT_MESSAGES_TO_KEEP:]
+
+    summary = llm.invoke(_build_summary_request(old_messages)).content
+    return _summary_result(pruned, recent_messages, summary)
+
+
+async def acompact(
+        messages: list[BaseMessage],
+        llm,
+        model_name: str | None = None,
+        context_limit: int | None = None,
+) -> list[BaseMessage]:
+    """Async variant of compact() — see compact() for the tiering strategy."""
+    pruned = prune_tool_outputs(messages)
+
+    if not should_compact(pruned, model_name=model_name, context_limit=context_limit):
+        return pruned
+
+    pruned = mask_old_observations(pruned)
+    if not should_compact(pruned, model_name=model_name, context_limit=context_limit):
+        return pruned
+
+    if len(pruned) <= RECENT_MESSAGES_TO_KEEP:
+        return pruned
+
+    old_messages = pruned[:-RECENT_MESSAGES_TO_KEEP]
+    recent_messages = pruned[-RECENT_MESSAGES_TO_KEEP:]
+
+    response = await llm.ainvoke(_build_summary_request(old_messages))
+    return _summary_result(pruned, recent_messages, response.content)
 
 
 
@@ -20,13 +20,14 @@ from typing_extensions import TypedDict
 
 from craftsman.tools.core import TOOLS
 from craftsman.agents.config import get_agent_config
+from craftsman.agents.subagents import MUTATING_TOOLS, invalidate_delegation_cache
 from craftsman.permission.rules import evaluate_permission, PermissionAction, get_agent_rules
 from craftsman.graph.safety import check_doom_loop, format_doom_loop_warning, DOOM_LOOP_THRESHOLD
 from craftsman.graph.compaction import (
     should_compact,
-    prune_tool_outputs,
+    compact,
     RECENT_MESSAGES_TO_KEEP,
-    SUMMARY_PROMPT,
+    SUMMARY_MARKER,
 )
 from craftsman.graph.builder import get_model
 
@@ -100,7 +101,15 @@ def build_custom_agent(
         # Prepend system prompt if not already present.
         # final_system_prompt is captured from the outer build scope so it's
         # computed once at agent-build time (not re-evaluated per turn).
-        if not messages or not isinstance(messages[0], SystemMessage):
+        # A compaction summary is also a SystemMessage (and sits at index 0
+        # after a summary-tier compaction), but it is not the agent's
+        # prompt — the prompt must still be injected ahead of it.
+        has_agent_prompt = (
+            bool(messages)
+            and isinstance(messages[0], SystemMessage)
+            and not messages[0].content.startswith(SUMMARY_MARKER)
+        )
+        if not has_agent_prompt:
             messages = [SystemMessage(content=final_system_prompt)] + list(messages)
 
         # BEFORE_AGENT hook
@@ -229,6 +238,12 @@ def build_custom_agent(
         # Use ToolNode to execute
         tool_node = ToolNode(tools)
         result = tool_node.invoke(state)
+
+        # A mutating tool makes cached delegation results stale — a
+        # re-review or re-research after an edit must see the new tree,
+        # not the memoized pre-edit answer.
+        if any(call["tool"] in MUTATING_TOOLS for call in new_tool_calls):
+            invalidate_delegation_cache(session_id)
         
         # AFTER_TOOL hook
         if hook_system:
@@ -290,34 +305,16 @@ def build_custom_agent(
         # Perform compaction by summarizing old messages
         if len(messages) <= RECENT_MESSAGES_TO_KEEP:
             return {"needs_compaction": False}
-        
-        # First, prune old tool outputs to save space
-        pruned_messages = prune_tool_outputs(messages)
-        
-        # Split messages
-        old_messages = pruned_messages[:-RECENT_MESSAGES_TO_KEEP]
-        recent_messages = pruned_messages[-RECENT_MESSAGES_TO_KEEP:]
-        
-        # Generate summary using the model (actual LLM call)
-        summary_request = [
-            SystemMessage(content=SUMMARY_PROMPT),
-            *old_messages,
-            HumanMessage(content="Please summarize the above conversation.")
-        ]
-        
-        # Use the base model (without tools) for summarization
+
+        # Two-phase compaction: prune tool outputs first, and only pay for
+        # an LLM summary if the history is still over the threshold.
+        # Use the base model (without tools) for summarization.
         base_model = get_model(model_name)
-        summary_response = base_model.invoke(summary_request)
-        summary = summary_response.content
-        
-        summary_message = SystemMessage(
-            content=f"[CONVERSATION SUMMARY]\n{summary}\n[END SUMMARY]\n\n"
-                    f"The above summarizes our earlier conversation. Recent messages follow:"
-        )
-        
+        compacted = compact(messages, base_model, model_name=model_name)
+
         # Return new compacted messages
         return {
-            "messages": [summary_message] + recent_messages,
+            "messages": compacted,
             "needs_compaction": False,
         }
     
@@ -9,13 +9,16 @@ from typing import Any
 DOOM_LOOP_THRESHOLD = 3
 
 
-
 def check_doom_loop(recent_tool_calls: list[dict[str, Any]]) -> bool:
     """Check if we're in a doom loop (same tool called repeatedly with same args).
 
     A doom loop occurs when the agent calls the same tool 3+ times
     with identical arguments, indicating it's stuck.
 
+    The graph keeps tool-call history as plain dicts in checkpointed
+    state, so this list-based check stays the graph-facing API; it
+    early-exits on the first mismatch rather than comparing every pair.
+
     Args:
         recent_tool_calls: List of recent tool calls, each with 'tool' and 'args' keys
     Returns:
@@ -24,14 +27,14 @@ def check_doom_loop(recent_tool_calls: list[dict[str, Any]]) -> bool:
     if len(recent_tool_calls) < DOOM_LOOP_THRESHOLD:
         return False
 
-    last_n = recent_tool_calls[-DOOM_LOOP_THRESHOLD:] 
-    first_call = last_n[0]
+    first_call = recent_tool_calls[-DOOM_LOOP_THRESHOLD]
+    first_tool = first_call.get("tool")
+    first_args = first_call.get("args")
 
-    return all(
-        call.get("tool") == first_call.get("tool") and
-        call.get("args") == first_call.get("args")
-        for call in last_n
-    )
+    for call in recent_tool_calls[-DOOM_LOOP_THRESHOLD + 1:]:
+        if call.get("tool") != first_tool or call.get("args") != first_args:
+            return False
+    return True
 
 def format_doom_loop_warning(tool_name: str, args: dict) -> str:
     """Format a warning message for doom loop detection."""
@@ -5,16 +5,43 @@ Inpired by Claude Code Hooks.
 """
 
 import asyncio
+import atexit
 import json
 import os
+import re
+import shlex
 import signal
 import sys
 import tempfile
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+# Commands containing any of these need a real shell (pipes, redirects,
+# globs, substitutions, quoting, embedded newlines, ...). Anything else
+# can be exec'd directly.
+_NEEDS_SHELL = re.compile(r"[|<>&;$`(){}*?\[\]~'\"\n]")
+
+
+def _needs_shell(command: str) -> bool:
+    """True when the command relies on shell semantics.
+
+    Besides metacharacters and quoting, a leading VAR=value assignment is
+    shell syntax — exec'ing it would try to run a binary named "VAR=value".
+    """
+    if _NEEDS_SHELL.search(command):
+        return True
+    stripped = command.strip()
+    return bool(stripped) and "=" in stripped.split(None, 1)[0]
+
+
+@lru_cache(maxsize=128)
+def _split_argv(command: str) -> tuple[str, ...]:
+    """Split a metachar-free command into argv once per distinct command."""
+    return tuple(shlex.split(command))
+
 
 class HookTrigger(Enum):
     """When to trigger a hook."""
@@ -37,6 +64,24 @@ class HookConfig:
     enabled: bool = True
 
 
+# Lazily-written script files for inline-script hooks, one per HookConfig.
+# Keyed by id(); the entry also holds the hook itself so the id can't be
+# recycled while the cached path is alive. Files are removed at exit.
+_script_cache: dict[int, tuple[HookConfig, str]] = {}
+
+
+def _cleanup_script_cache() -> None:
+    for _, path in _script_cache.values():
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    _script_cache.clear()
+
+
+atexit.register(_cleanup_script_cache)
+
+
 @dataclass
 class HookSystemConfig:
     """Global hooks configuration."""
@@ -70,26 +115,62 @@ class HookSystem:
         self.hooks:list[HookConfig] = []
         if self.config.enabled:
             self.hooks = [h for h in self.config.hooks if h.enabled]
-    
+
+        # Bucket hooks by trigger once — BEFORE_TOOL/AFTER_TOOL fire on
+        # every tool call, so the per-trigger lookup should be O(1)
+        # rather than a filter over all hooks each time.
+        self._by_trigger: dict[HookTrigger, list[HookConfig]] = {
+            t: [] for t in HookTrigger
+        }
+        for hook in self.hooks:
+            self._by_trigger[hook.trigger].append(hook)
+
+        # Snapshot the process environment once. _build_env previously
+        # copied all of os.environ (often hundreds of entries) per
+        # trigger; now it only composes the handful of AI_AGENT_* extras
+        # on top of this base.
+        self._base_env: dict[str, str] = dict(os.environ)
+        self._base_env["AI_AGENT_CWD"] = str(self.config.cwd)
+
+
+    async def _run_hooks_for(self, trigger: HookTrigger, env: dict[str, str]) -> None:
+        """Run all hooks registered for a trigger concurrently.
+
+        Hooks are independent subprocesses with no ordering contract, so
+        running them sequentially just sums their latencies. gather caps
+        the wall-clock cost at the slowest hook; return_exceptions is
+        belt-and-suspenders since _run_hook already swallows errors.
+        """
+        hooks = self._by_trigger[trigger]
+        if hooks:
+            await asyncio.gather(
+                *(self._run_hook(hook, env) for hook in hooks),
+                return_exceptions=True,
+            )
+
     async def _run_hook(self, hook: HookConfig, env: dict[str, str]) -> None:
         """Run a single hook."""
         try:
             if hook.command:
                 await self._run_command(hook.command, hook.timeout_sec, env)
             elif hook.script:
-                # Write script to temp file and execute
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".sh", delete=False
-                ) as f:
-                    f.write("#!/bin/bash\n")
-                    f.write(hook.script)
-                    script_path = f.name
-                
-                try:
+                # Write the script to a temp file once per hook and reuse
+                # it — per-tool hooks fire hundreds of times per session,
+                # and a write/chmod/unlink cycle per run is pure overhead.
+                entry = _script_cache.get(id(hook))
+                if entry is None:
+                    with tempfile.NamedTemporaryFile(
+                        mode="w", suffix=".sh", delete=False
+                    ) as f:
+                        f.write("#!/bin/bash\n")
+                        f.write(hook.script)
+                        script_path = f.name
                     os.chmod(script_path, 0o755)
-                    await self._run_command(script_path, hook.timeout_sec, env)
-                finally:
-                    os.unlink(script_path)
+                    _script_cache[id(hook)] = (hook, script_path)
+                else:
+                    script_path = entry[1]
+
+                await self._run_command(script_path, hook.timeout_sec, env)
         
         except Exception as e:
             # Hooks should not crash the agent
@@ -103,19 +184,26 @@ class HookSystem:
         env: dict[str, str],
     ) -> None:
         """Run a command with timeout."""
-        
-        process = await asyncio.create_subprocess_shell(
-            command,
+
+        # stdout/stderr are PIPEd so hook output is captured rather than
+        # leaking into the TUI; the parent reads it via communicate().
+        spawn_kwargs = dict(
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
-            # stdout=asyncio.subprocess.PIPE – Captures the command's standard output (normal output) into a pipe that Python can read
-            # stderr=asyncio.subprocess.PIPE – Captures the command's standard error (error messages) into a pipe that Python can read
-            # What PIPE means: Instead of letting the output print to the terminal, it's redirected into a buffer that the parent process can access via process.communicate().
             cwd=str(self.config.cwd),
             env=env,
             start_new_session=True,
         )
 
+        if _needs_shell(command):
+            process = await asyncio.create_subprocess_shell(command, **spawn_kwargs)
+        else:
+            # Plain binary + args: exec directly and skip the /bin/sh -c
+            # wrapper — one fewer fork+exec per hook invocation.
+            process = await asyncio.create_subprocess_exec(
+                *_split_argv(command), **spawn_kwargs
+            )
+
         try:
             await asyncio.wait_for(process.communicate(), timeout=timeout)
         except asyncio.TimeoutError:
@@ -141,52 +229,52 @@ class HookSystem:
 
     ) -> dict[str, str]:
         """Build environment variables from hook execution."""
-        env = os.environ.copy()
-        env["AI_AGENT_TRIGGER"] = trigger.value
-        env["AI_AGENT_CWD"] = str(self.config.cwd)
-
+        extras = {"AI_AGENT_TRIGGER": trigger.value}
 
         if tool_name:
-            env["AI_AGENT_TOOL_NAME"] = tool_name
+            extras["AI_AGENT_TOOL_NAME"] = tool_name
         if tool_params:
-            env["AI_AGENT_TOOL_PARAMS"] = json.dumps(tool_params)
+            extras["AI_AGENT_TOOL_PARAMS"] = json.dumps(tool_params)
         if user_message:
-            env["AI_AGENT_USER_MESSAGE"] = user_message
+            extras["AI_AGENT_USER_MESSAGE"] = user_message
         if agent_response:
-            env["AI_AGENT_RESPONSE"] = agent_response
+            extras["AI_AGENT_RESPONSE"] = agent_response
         if error:
-            env["AI_AGENT_ERROR"] = str(error)
-        
-        return env
+            extras["AI_AGENT_ERROR"] = str(error)
+
+        # PEP 584 dict union — C-level merge, cheaper than copy()+update()
+        return self._base_env | extras
     
     async def trigger_before_agent(self, user_message: str) -> None:
         """Trigger hooks before agent processes a message."""
+        if not self._by_trigger[HookTrigger.BEFORE_AGENT]:
+            return
         env = self._build_env(HookTrigger.BEFORE_AGENT, user_message=user_message)
-        for hook in self.hooks:
-            if hook.trigger == HookTrigger.BEFORE_AGENT:
-                await self._run_hook(hook, env) 
+        await self._run_hooks_for(HookTrigger.BEFORE_AGENT, env)
 
     async def trigger_after_agent(self, user_message: str, agent_response: str) -> None:
         """Trigger hooks after agent completes a response."""
+        if not self._by_trigger[HookTrigger.AFTER_AGENT]:
+            return
         env = self._build_env(
             HookTrigger.AFTER_AGENT,
             user_message=user_message,
             agent_response=agent_response,
         )
-        for hook in self.hooks:
-            if hook.trigger == HookTrigger.AFTER_AGENT:
-                await self._run_hook(hook, env)
+        await self._run_hooks_for(HookTrigger.AFTER_AGENT, env)
     
     async def trigger_before_tool(self, tool_name: str, tool_params: dict[str, Any]) -> None:
         """Trigger hooks before a tool is executed."""
+        # Zero hooks for a trigger is the common case, and the per-tool
+        # triggers fire on every tool call — bail before building the env.
+        if not self._by_trigger[HookTrigger.BEFORE_TOOL]:
+            return
         env = self._build_env(
             HookTrigger.BEFORE_TOOL,
             tool_name=tool_name,
             tool_params=tool_params,
         )
-        for hook in self.hooks:
-            if hook.trigger == HookTrigger.BEFORE_TOOL:
-                await self._run_hook(hook, env)
+        await self._run_hooks_for(HookTrigger.BEFORE_TOOL, env)
 
     async def trigger_after_tool(
         self,
@@ -195,19 +283,19 @@ class HookSystem:
         tool_result: str,
     ) -> None:
         """Trigger hooks after a tool completes."""
+        if not self._by_trigger[HookTrigger.AFTER_TOOL]:
+            return
         env = self._build_env(
             HookTrigger.AFTER_TOOL,
             tool_name=tool_name,
             tool_params=tool_params,
         )
         env["AI_AGENT_TOOL_RESULT"] = tool_result
-        for hook in self.hooks:
-            if hook.trigger == HookTrigger.AFTER_TOOL:
-                await self._run_hook(hook, env)
+        await self._run_hooks_for(HookTrigger.AFTER_TOOL, env)
     
     async def trigger_on_error(self, error: Exception) -> None:
         """Trigger hooks when an error occurs."""
+        if not self._by_trigger[HookTrigger.ON_ERROR]:
+            return
         env = self._build_env(HookTrigger.ON_ERROR, error=error)
-        for hook in self.hooks:
-            if hook.trigger == HookTrigger.ON_ERROR:
-                await self._run_hook(hook, env)
\ No newline at end of file
+        await self._run_hooks_for(HookTrigger.ON_ERROR, env)
\ No newline at end of file
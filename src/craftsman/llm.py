@@ -5,6 +5,8 @@ Users only need a single OPENROUTER_API_KEY.
 """
 
 import os
+from functools import lru_cache
+
 from langchain_openai import ChatOpenAI
 
 
@@ -31,16 +33,44 @@ DEFAULT_MODEL = "sonnet"
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
 
+@lru_cache(maxsize=8)
+def _build_llm(model_id: str, api_key: str) -> ChatOpenAI:
+    """Construct (and cache) the ChatOpenAI client for a resolved model.
+
+    Building a ChatOpenAI spins up an httpx client (TLS setup, connection
+    pool) and tokenizer state; sharing one instance per model across
+    turns keeps the connection pool warm. ChatOpenAI is safe to share —
+    invocations don't mutate the client.
+    """
+    return ChatOpenAI(
+        model=model_id,
+        base_url=OPENROUTER_BASE_URL,
+        api_key=api_key,
+        default_headers={
+            "HTTP-Referer": "https://github.com/agent-cli",  # Optional: for tracking
+            "X-Title": "Agent CLI",  # Optional: shows in OpenRouter dashboard
+        },
+    )
+
+
+def reset_llm_cache() -> None:
+    """Drop cached LLM clients (e.g. after an API key change, or in tests)."""
+    _build_llm.cache_clear()
+
+
 def get_llm(model_name: str | None = None) -> ChatOpenAI:
     """Get an LLM instance via OpenRouter.
-    
+
+    Instances are cached per (model, API key), so repeated calls during
+    a session reuse the same client and its HTTP connection pool.
+
     Args:
         model_name: Model alias (sonnet, opus, haiku, gpt4o, gpt4o-mini)
                     or full OpenRouter model ID
-    
+
     Returns:
         ChatOpenAI instance configured for OpenRouter
-    
+
     Raises:
         ValueError: If OPENROUTER_API_KEY is not set
     """
@@ -50,19 +80,11 @@ def get_llm(model_name: str | None = None) -> ChatOpenAI:
             "OPENROUTER_API_KEY environment variable is required.\n"
             "Get your API key at: https://openrouter.ai/keys"
         )
-    
+
     # Resolve model alias to full ID
     model_id = MODELS.get(model_name or DEFAULT_MODEL, model_name or MODELS[DEFAULT_MODEL])
-    
-    return ChatOpenAI(
-        model=model_id,
-        base_url=OPENROUTER_BASE_URL,
-        api_key=api_key,
-        default_headers={
-            "HTTP-Referer": "https://github.com/agent-cli",  # Optional: for tracking
-            "X-Title": "Agent CLI",  # Optional: shows in OpenRouter dashboard
-        },
-    )
+
+    return _build_llm(model_id, api_key)
 
 
 def list_models() -> dict[str, str]:
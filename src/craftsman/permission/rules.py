@@ -5,9 +5,23 @@ Includes session-level approval memory for "remember this decision" feature.
 Supports approval policies: ask, auto, yolo, never.
 """
 
+import re
+from collections.abc import Sequence
 from enum import Enum
 from dataclasses import dataclass
-from fnmatch import fnmatch
+from fnmatch import translate
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _compile_glob(pat: str) -> re.Pattern:
+    """Compile a glob pattern to a regex, cached.
+
+    fnmatch.fnmatch recompiles (and re-casefolds) its pattern on every
+    call; permission checks run before every tool call, so we pay that
+    once per distinct pattern instead.
+    """
+    return re.compile(translate(pat))
 
 class PermissionAction(Enum):
     """Action to take for a permission check."""
@@ -29,16 +43,9 @@ class ApprovalPolicy(Enum):
     NEVER = "never"
 
 
-def apply_policy(action: PermissionAction, policy: ApprovalPolicy) -> PermissionAction:
-    """Apply approval policy to modify the permission action.
-
-    Args:
-        action: The original permission action from rules
-        policy: The session's approval policy
-    
-    Returns:
-        Modified action based on policy
-    """
+def _apply_policy_impl(action: PermissionAction, policy: ApprovalPolicy) -> PermissionAction:
+    """Policy logic, spelled out as branches. Only used to build the
+    lookup table below — callers go through apply_policy."""
 
     if action == PermissionAction.DENY:
         # DENY is always respected regardless of policy
@@ -59,7 +66,31 @@ def apply_policy(action: PermissionAction, policy: ApprovalPolicy) -> Permission
         return PermissionAction.DENY
     else:  # ASK policy
         return PermissionAction.ASK
-    
+
+
+# All 12 (action, policy) combinations, precomputed at import. apply_policy
+# runs before every ASK-gated tool call; a dict lookup beats re-walking the
+# branch ladder each time.
+_POLICY_TABLE: dict[tuple[PermissionAction, ApprovalPolicy], PermissionAction] = {
+    (a, p): _apply_policy_impl(a, p)
+    for a in PermissionAction
+    for p in ApprovalPolicy
+}
+
+
+def apply_policy(action: PermissionAction, policy: ApprovalPolicy) -> PermissionAction:
+    """Apply approval policy to modify the permission action.
+
+    Args:
+        action: The original permission action from rules
+        policy: The session's approval policy
+
+    Returns:
+        Modified action based on policy
+    """
+    return _POLICY_TABLE[(action, policy)]
+
+
 
 @dataclass
 class PermissionRule:
@@ -74,6 +105,12 @@ class PermissionRule:
     pattern: str
     action: PermissionAction
 
+    def __post_init__(self) -> None:
+        # Precompile both globs so evaluate_permission matches against
+        # ready regexes instead of going through fnmatch per check.
+        self._tool_re = _compile_glob(self.permission)
+        self._pat_re = _compile_glob(self.pattern)
+
 
 # Default permission rules (order matters - last match wins)
 DEFAULT_RULES: list[PermissionRule] = [
@@ -98,45 +135,45 @@ DEFAULT_RULES: list[PermissionRule] = [
 # Session-level approval memory
 # ============================================================================
 
-# Cache for session-scoped approvals (cleared on new session)
-_session_approvals: dict[str, PermissionAction] = {}
-
-def _make_approval_key(tool: str, pattern: str) -> str:
-    """Create a unique key for tool+pattern combo."""
-    return f"{tool}:{pattern}"
+# Cache for session-scoped approvals (cleared on new session).
+# Keyed by (tool, pattern) tuples — tuple hashing beats building an
+# f-string key per lookup, and a ':' in either part can't alias keys.
+_session_approvals: dict[tuple[str, str], PermissionAction] = {}
 
 
 def remember_approval(tool: str, pattern: str, action: PermissionAction) -> None:
     """Remember an approval decision for this session.
-    
+
     Args:
         tool: Tool name that was approved/denied
         pattern: Pattern (e.g., file path) that was approved/denied
         action: The action to remember (ALLOW or DENY)
     """
-    key = _make_approval_key(tool, pattern)
-    _session_approvals[key] = action
+    _session_approvals[(tool, pattern)] = action
+    # Memory is consulted before the memoized matcher, but drop its cache
+    # anyway so a stale entry can never shadow a changed decision.
+    _match_rules.cache_clear()
 
 
 def get_remembered_approval(tool: str, pattern: str) -> PermissionAction | None:
     """Check if we already have a remembered approval for this tool+pattern.
-    
+
     Args:
         tool: Tool name to check
         pattern: Pattern to check
-    
+
     Returns:
         The remembered action, or None if not found
     """
-    key = _make_approval_key(tool, pattern)
-    return _session_approvals.get(key)
+    return _session_approvals.get((tool, pattern))
 
 def clear_session_approvals() -> None:
     """Clear all remembered approvals (call when starting new session)."""
     _session_approvals.clear()
+    _match_rules.cache_clear()
 
 
-def list_session_approvals() -> dict[str, PermissionAction]:
+def list_session_approvals() -> dict[tuple[str, str], PermissionAction]:
     """List all current session approvals (for debugging/UI)."""
     return dict(_session_approvals)
 
@@ -150,7 +187,7 @@ def list_session_approvals() -> dict[str, PermissionAction]:
 def evaluate_permission(
         tool_name: str,
         pattern: str = "*",
-        rules: list[PermissionRule] | None = None,
+        rules: Sequence[PermissionRule] | None = None,
         check_memory: bool = True,
 ) -> PermissionAction:
     """Evaluate permission for a tool call.
@@ -174,17 +211,55 @@ def evaluate_permission(
             return remembered
     
     if rules is None:
-        rules = DEFAULT_RULES
-    
+        rules = _AGENT_RULES_CACHE["__default__"]
+
+
+    if isinstance(rules, tuple):
+        # Frozen rule sets (the precomputed agent tuples) are kept alive
+        # by the registry, so id() is a stable, hashable cache key.
+        key = id(rules)
+        if key not in _RULES_BY_KEY:
+            _RULES_BY_KEY[key] = rules
+        return _match_rules(tool_name, pattern, key)
+
+    return _match_rules_uncached(tool_name, pattern, rules)
+
+
+# Registry of frozen rule tuples, keyed by id(). Holding the reference
+# here is what keeps the id valid for the lifetime of the cache.
+_RULES_BY_KEY: dict[int, tuple[PermissionRule, ...]] = {}
+
+
+@lru_cache(maxsize=4096)
+def _match_rules(tool_name: str, pattern: str, rules_key: int) -> PermissionAction:
+    """Memoized rule matching for frozen rule sets.
+
+    Sessions evaluate the same (tool, pattern) pairs over and over
+    (repeated reads of the same file, repeated bash commands); after the
+    first evaluation the answer is a dict lookup instead of an O(rules)
+    glob scan.
+    """
+    return _match_rules_uncached(tool_name, pattern, _RULES_BY_KEY[rules_key])
+
+
+def _match_rules_uncached(
+        tool_name: str,
+        pattern: str,
+        rules: Sequence[PermissionRule],
+) -> PermissionAction:
+    """Last-match-wins scan over the rules; the pure matching core."""
     result = PermissionAction.ASK   # Default to ask if no rules match
 
     for rule in rules:
-        # Check if tool matches
-        if fnmatch(tool_name, rule.permission) or fnmatch(rule.permission, tool_name):
+        # Check if tool matches. Matching is one-directional: the rule's
+        # permission is the glob, the tool name is the subject. (The old
+        # reverse match treated tool names themselves as patterns, which
+        # no rule relied on and doubled the regex work per check.)
+        if rule._tool_re.match(tool_name):
             # Check if pattern matches
-            if fnmatch(pattern, rule.pattern) or rule.pattern == "*":
+            if rule._pat_re.match(pattern) or rule.pattern == "*":
                 result = rule.action
-    
+
     return result
 
 
@@ -219,11 +294,22 @@ AGENT_PERMISSIONS: dict[str, list[PermissionRule]] = {
 }
 
 
-def get_agent_rules(agent_name: str) -> list[PermissionRule]:
+# Merged rule set per agent, frozen at import time. AGENT_PERMISSIONS is
+# a module constant, so there's no reason to re-merge (and re-allocate a
+# list) on every permission check. Tuples also make the rule sets safely
+# shareable and cacheable downstream.
+_AGENT_RULES_CACHE: dict[str, tuple[PermissionRule, ...]] = {
+    "__default__": tuple(DEFAULT_RULES),
+    **{
+        name: tuple(DEFAULT_RULES) + tuple(extra)
+        for name, extra in AGENT_PERMISSIONS.items()
+    },
+}
+
+
+def get_agent_rules(agent_name: str) -> tuple[PermissionRule, ...]:
     """Get permission rules for a specific agent."""
-    base_rules = DEFAULT_RULES.copy()
-    agent_rules = AGENT_PERMISSIONS.get(agent_name, [])
-    return merge_rules(base_rules, agent_rules)
+    return _AGENT_RULES_CACHE.get(agent_name, _AGENT_RULES_CACHE["__default__"])
 
 
 
@@ -1,10 +1,45 @@
 """Core tools for the coding agent."""
 
-from pathlib import Path
+import difflib
+import heapq
+import mmap
+import os
+import re
+import select
+import shlex
+import shutil
+import signal
 import subprocess
+import threading
+import time
+from pathlib import Path
+
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+# Prefer ripgrep when installed — parallel directory walker plus SIMD
+# literal matching, typically ~10x system grep on large trees. Resolved
+# once at import; None means fall back to grep.
+_RG_PATH = shutil.which("rg")
+
+# Characters that make a pattern a regex rather than a plain literal.
+_REGEX_META = set(".^$*+?()[]{}|\\")
+
+
+def _is_literal_pattern(pattern: str) -> bool:
+    """True when the pattern contains no regex metacharacters, so the
+    search tool can use its fixed-string fast path (-F)."""
+    return not any(c in _REGEX_META for c in pattern)
+
+
+# LC_ALL=C switches grep to plain byte comparisons instead of UTF-8
+# collation/character-class handling — a sizable speedup on ASCII trees,
+# with no effect on which lines match for the patterns agents send.
+_GREP_ENV = {**os.environ, "LC_ALL": "C"}
+
+# Cap on glob results returned to the model.
+_GLOB_RESULT_LIMIT = 50
+
 class ReadFileInput(BaseModel):
     """Input schema for read_file tool."""
     file_path: str = Field(description="Absolute path to the file to read")
@@ -40,11 +75,65 @@ class GlobInput(BaseModel):
     path: str = Field(default=".", description="Base directory to search from")
 
 
+# Above this size, a line-range read walks newlines in an mmap instead
+# of decoding and splitting the whole file.
+_MMAP_RANGE_THRESHOLD = 256 * 1024
+
+
+def _read_line_range_mmap(path: Path, start_line: int, end_line: int) -> str:
+    """Read a 1-indexed line range by scanning newlines in an mmap.
+
+    Avoids materializing the full decoded text and the full line list for
+    a small slice of a large file — only the requested bytes are copied
+    out and decoded. mm.find uses memchr under the hood, so the newline
+    scan runs at C speed.
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            try:
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            except (AttributeError, OSError):
+                pass  # madvise is best-effort and platform-dependent
+
+            pos = 0
+            line = 1
+            while line < start_line:
+                nl = mm.find(b"\n", pos)
+                if nl < 0:
+                    return ""  # Range starts past EOF
+                pos = nl + 1
+                line += 1
+            start = pos
+
+            while line <= end_line:
+                nl = mm.find(b"\n", pos)
+                if nl < 0:
+                    pos = len(mm)
+                    break
+                pos = nl + 1
+                line += 1
+
+            text = bytes(mm[start:pos]).decode("utf-8", errors="replace")
+            # Join-of-splitlines matches the small-file path exactly:
+            # CRLF endings are normalized (no stray \r to break later
+            # edit_file exact matches) and no trailing newline remains.
+            return "\n".join(text.splitlines())
+
+
 @tool(args_schema=ReadFileInput)
 def read_file(file_path: str, start_line: int | None = None, end_line: int | None = None) -> str:
     """Read the contents of a file. Optionally specify line range."""
     try:
-        content = Path(file_path).read_text()
+        if start_line is not None and end_line is not None:
+            path = Path(file_path)
+            if path.stat().st_size > _MMAP_RANGE_THRESHOLD:
+                return _read_line_range_mmap(path, start_line, end_line)
+
+        # read_bytes + decode skips the TextIOWrapper/buffered layers that
+        # read_text stacks on top of the raw read — measurably faster for
+        # whole-file reads, and errors="replace" keeps mixed-encoding
+        # files readable instead of raising.
+        content = Path(file_path).read_bytes().decode("utf-8", errors="replace")
         lines = content.splitlines()
         
         if start_line is not None and end_line is not None:
@@ -59,51 +148,155 @@ def read_file(file_path: str, start_line: int | None = None, end_line: int | Non
         return f"Error reading file: {e}"
 
 
+# Payloads above this go through a raw os.write instead of the buffered
+# write_bytes path — one syscall on the whole blob, no block flushes.
+_LARGE_WRITE_THRESHOLD = 1024 * 1024
+
+# Parent directories already confirmed to exist this process. mkdir with
+# exist_ok=True still costs a full syscall round-trip per call; repeat
+# writes into the same directory skip it.
+_seen_parents: set[str] = set()
+
+
+def _write_payload(path: Path, data: bytes) -> None:
+    """Write pre-encoded bytes, using a raw fd for large payloads."""
+    if len(data) <= _LARGE_WRITE_THRESHOLD:
+        path.write_bytes(data)
+        return
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 @tool(args_schema=WriteFileInput)
 def write_file(file_path: str, content: str) -> str:
     """Write content to a file. Creates parent directories if needed."""
     try:
         path = Path(file_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(content)
+        parent = str(path.parent)
+        if parent not in _seen_parents:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _seen_parents.add(parent)
+
+        data = content.encode("utf-8")
+        try:
+            _write_payload(path, data)
+        except FileNotFoundError:
+            # The cached parent was removed out from under us — recreate
+            # it and retry once.
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_payload(path, data)
         return f"Successfully wrote {len(content)} bytes to {file_path}"
     except Exception as e:
         return f"Error writing file: {e}"
 
 
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@")
+
+
+def _trimmed_unified_diff(
+    old_text: str,
+    new_text: str,
+    change_start: int,
+    old_change_len: int,
+    new_change_len: int,
+    fromfile: str,
+    tofile: str,
+    context: int = 3,
+) -> str:
+    """Unified diff for a single contiguous replacement.
+
+    edit_file replaces exactly one region, so instead of splitting both
+    whole files and letting difflib walk every line, diff only the
+    changed region plus `context` lines either side, then shift the hunk
+    headers by the window's offset so line numbers still refer to the
+    full file.
+    """
+    # Window start: back up `context` newlines from the changed line's start.
+    off = old_text.rfind("\n", 0, change_start)
+    for _ in range(context):
+        if off < 0:
+            break
+        off = old_text.rfind("\n", 0, off)
+    win_start = off + 1  # -1 + 1 == 0 when we hit the top of the file
+
+    def _forward(text: str, pos: int) -> int:
+        # Advance past the change's final line plus `context` more lines.
+        for _ in range(context + 1):
+            nl = text.find("\n", pos)
+            if nl < 0:
+                return len(text)
+            pos = nl + 1
+        return pos
+
+    old_window = old_text[win_start:_forward(old_text, change_start + old_change_len)]
+    new_window = new_text[win_start:_forward(new_text, change_start + new_change_len)]
+
+    diff = difflib.unified_diff(
+        old_window.splitlines(keepends=True),
+        new_window.splitlines(keepends=True),
+        fromfile=fromfile,
+        tofile=tofile,
+        lineterm="",
+        n=context,
+    )
+
+    # Hunk numbers come out window-relative; shift them to file coordinates.
+    offset = old_text.count("\n", 0, win_start)
+    lines = []
+    for line in diff:
+        m = _HUNK_HEADER_RE.match(line)
+        if m:
+            line = (
+                f"@@ -{int(m.group(1)) + offset}{m.group(2) or ''} "
+                f"+{int(m.group(3)) + offset}{m.group(4) or ''} @@"
+            )
+        lines.append(line)
+    return "".join(lines)
+
+
 @tool(args_schema=EditFileInput)
 def edit_file(file_path: str, old_content: str, new_content: str) -> str:
     """Edit a file by replacing exact text. The old_content must match exactly.
-    
+
     Returns a unified diff showing the changes made.
     """
-    import difflib
-    
     try:
         path = Path(file_path)
-        content = path.read_text()
-        
-        if old_content not in content:
+        content = path.read_bytes().decode("utf-8", errors="replace")
+
+        # One find() locates the match; a second bounded find() checks for
+        # ambiguity. The old `in` + count() pair scanned the file twice
+        # in full even after the membership test had already found it.
+        idx = content.find(old_content)
+        if idx < 0:
             return f"Error: Could not find the specified text to replace in {file_path}"
-        
-        if content.count(old_content) > 1:
+
+        if content.find(old_content, idx + 1) >= 0:
             return f"Error: Found multiple occurrences of the text. Please be more specific."
-        
-        new_file_content = content.replace(old_content, new_content, 1)
-        path.write_text(new_file_content)
-        
-        # Generate unified diff
-        old_lines = content.splitlines(keepends=True)
-        new_lines = new_file_content.splitlines(keepends=True)
-        diff = difflib.unified_diff(
-            old_lines,
-            new_lines,
+
+        # Splice directly — str.replace would rescan from the start.
+        new_file_content = content[:idx] + new_content + content[idx + len(old_content):]
+        path.write_bytes(new_file_content.encode("utf-8"))
+
+        # Diff only the replaced region plus context — the edit is a
+        # single contiguous change, so there's no need to walk both
+        # whole files line by line.
+        diff_text = _trimmed_unified_diff(
+            content,
+            new_file_content,
+            idx,
+            len(old_content),
+            len(new_content),
             fromfile=f"a/{path.name}",
             tofile=f"b/{path.name}",
-            lineterm="",
         )
-        diff_text = "".join(diff)
-        
+
         if diff_text:
             return f"Successfully edited {file_path}\n\n```diff\n{diff_text}\n```"
         else:
@@ -114,22 +307,126 @@ def edit_file(file_path: str, old_content: str, new_content: str) -> str:
         return f"Error editing file: {e}"
 
 
+class _BashSession:
+    """Long-lived bash child shared by all run_bash calls.
+
+    Spawning a fresh shell per command pays a fork+exec (~5-20 ms each)
+    that dominates agent loops running dozens of commands. One bash is
+    kept alive instead; commands are written to its stdin followed by a
+    sentinel line that carries the exit code, and stdout is read up to
+    that sentinel. Each command runs inside a subshell so cwd and
+    environment changes can't leak between calls — same observable
+    semantics as the old one-shot subprocess.run. The session is killed
+    and respawned on timeout or breakage.
+    """
+
+    _SENTINEL = "__CRAFTSMAN_BASH_DONE__"
+
+    # Commands producing more than this are killed and their output
+    # truncated — bounds peak memory regardless of what the command
+    # prints (a stray `cat largefile` would otherwise buffer it all).
+    _MAX_OUTPUT_BYTES = 1024 * 1024
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_proc(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["bash"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                start_new_session=True,
+            )
+        return self._proc
+
+    def _kill(self) -> None:
+        if self._proc is not None:
+            try:
+                os.killpg(os.getpgid(self._proc.pid), signal.SIGKILL)
+            except (ProcessLookupError, OSError):
+                self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def run(self, command: str, working_dir: str = ".", timeout: float = 60.0) -> str:
+        with self._lock:
+            proc = self._ensure_proc()
+            # stdin comes from /dev/null: a command that reads stdin (cat,
+            # python, ...) would otherwise swallow the sentinel line and
+            # poison the shared shell for every later call.
+            script = (
+                f"( cd {shlex.quote(working_dir)} && {{\n{command}\n}} ) < /dev/null\n"
+                f'echo "{self._SENTINEL}$?"\n'
+            )
+            try:
+                proc.stdin.write(script.encode())
+                proc.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._kill()
+                return f"Error executing command: {e}"
+
+            buf = b""
+            marker = self._SENTINEL.encode()
+            fd = proc.stdout.fileno()
+            deadline = time.monotonic() + timeout
+
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # A stuck command would poison the shared shell — kill
+                    # the whole process group and start fresh next call.
+                    self._kill()
+                    return "Error: Command timed out after 60 seconds"
+
+                ready, _, _ = select.select([fd], [], [], remaining)
+                if not ready:
+                    continue
+
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    # bash itself exited (e.g. the command called `exit`)
+                    returncode = proc.wait()
+                    self._proc = None
+                    return f"Exit code: {returncode}\n{buf.decode('utf-8', 'replace')}"
+
+                buf += chunk
+                # Only a sentinel at the start of a line terminates the
+                # command — output that merely contains the string
+                # (e.g. a script echoing this file) must not match.
+                idx = buf.rfind(marker)
+                while idx > 0 and buf[idx - 1:idx] != b"\n":
+                    idx = buf.rfind(marker, 0, idx)
+                if idx < 0 and len(buf) > self._MAX_OUTPUT_BYTES:
+                    # Still mid-command and over budget: stop the command
+                    # rather than buffering unbounded output.
+                    self._kill()
+                    head = buf[:self._MAX_OUTPUT_BYTES].decode("utf-8", "replace")
+                    return (
+                        f"Exit code: -9\n{head}\n\n"
+                        "[OUTPUT TRUNCATED - command exceeded 1 MiB of output and was terminated]"
+                    )
+                if idx >= 0 and b"\n" in buf[idx:]:
+                    line_end = buf.index(b"\n", idx)
+                    code_text = buf[idx + len(marker):line_end].decode("ascii", "replace").strip()
+                    try:
+                        returncode = int(code_text)
+                    except ValueError:
+                        returncode = 1
+                    return f"Exit code: {returncode}\n{buf[:idx].decode('utf-8', 'replace')}"
+
+
+_bash_session = _BashSession()
+
+
 @tool(args_schema=BashInput)
 def run_bash(command: str, working_dir: str = ".") -> str:
     """Execute a bash command and return the output."""
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            cwd=working_dir,
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        output = result.stdout + result.stderr
-        return f"Exit code: {result.returncode}\n{output}"
-    except subprocess.TimeoutExpired:
-        return "Error: Command timed out after 60 seconds"
+        return _bash_session.run(command, working_dir)
     except Exception as e:
         return f"Error executing command: {e}"
 
@@ -139,15 +436,34 @@ def grep(pattern: str, path: str, case_insensitive: bool = False) -> str:
     Search for a pattern in files using grep.
     """
     try:
-        flags = "-rn"
-        if case_insensitive:
-            flags += "i"
+        if _RG_PATH:
+            # --hidden/--no-ignore match the grep -rn fallback's scope:
+            # dotfiles, dot-directories, and gitignored paths are searched
+            # too, so results don't depend on which binary is installed.
+            # Only .git itself is skipped — object/pack noise, and the one
+            # deliberate narrowing versus raw grep -rn.
+            cmd = [_RG_PATH, "--no-messages", "-n", "--hidden", "--no-ignore", "-g", "!.git"]
+            if case_insensitive:
+                cmd.append("-i")
+            if _is_literal_pattern(pattern):
+                cmd.append("-F")
+            cmd.extend([pattern, path])
+        else:
+            cmd = ["grep", "-rn"]
+            if case_insensitive:
+                cmd.append("-i")
+            if _is_literal_pattern(pattern):
+                cmd.append("-F")
+            cmd.extend([pattern, path])
+
+        # argv list, no shell=True: skips the /bin/sh wrapper and makes
+        # quoting in patterns/paths a non-issue.
         result = subprocess.run(
-            f"grep {flags} '{pattern}' {path}",
-            shell=True,
+            cmd,
             capture_output=True,
             text=True,
             timeout=30,
+            env=_GREP_ENV,
         )
 
         if result.returncode == 0:
@@ -166,12 +482,17 @@ def glob_files(pattern: str, path:str = ".") -> str:
     """Find files matching a glob pattern."""
     try:
         base_path = Path(path)
-        matches = list(base_path.glob(pattern))
+        # Stream the glob generator through a bounded heap: no full match
+        # list is materialized, and selecting the lexicographically
+        # smallest paths is O(N log k) instead of a full O(N log N) sort.
+        matches = heapq.nsmallest(
+            _GLOB_RESULT_LIMIT, (str(m) for m in base_path.glob(pattern))
+        )
 
         if not matches:
             return "No files found matching pattern"
-        
-        return "\n".join(str(m) for m in sorted(matches)[:50]) # Limit to 50
+
+        return "\n".join(matches)
     except Exception as e:
         return f"Error during glob: {e}"
 
@@ -5,33 +5,98 @@ across sessions. Stores data in ~/.agent-cli/memory.json.
 """
 
 import json
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+# orjson (Rust) serializes and parses several times faster than the
+# stdlib json module; fall back cleanly when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+
+def _dumps(obj: dict) -> bytes:
+    """Serialize to indented JSON bytes with the fastest available codec."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> dict:
+    """Parse JSON bytes with the fastest available codec."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@lru_cache(maxsize=1)
 def _get_memory_path() -> Path:
-    """Get the path to the memory file."""
+    """Get the path to the memory file (and create its directory once).
+
+    The location is invariant per process, so the Path.home() lookup and
+    the mkdir probe run on the first call only.
+    """
     data_dir = Path.home() / ".agent-cli"
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir / "memory.json"
 
 
+# Parsed memory file, cached per process and invalidated by mtime — the
+# common back-to-back tool calls skip the read + JSON parse entirely.
+_memory_cache: tuple[int, dict] | None = None
+
+
 def _load_memory() -> dict:
-    """Load memory from file."""
+    """Load memory from file (cached until the file changes on disk)."""
+    global _memory_cache
     path = _get_memory_path()
-    if not path.exists():
+    try:
+        st = path.stat()
+    except FileNotFoundError:
         return {"entries": {}}
+
+    if _memory_cache is not None and _memory_cache[0] == st.st_mtime_ns:
+        return _memory_cache[1]
+
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        data = _loads(path.read_bytes())
     except Exception:
         return {"entries": {}}
+    _memory_cache = (st.st_mtime_ns, data)
+    return data
 
 
 def _save_memory(memory: dict) -> None:
-    """Save memory to file."""
+    """Save memory to file (atomic temp-file + rename)."""
+    global _memory_cache
     path = _get_memory_path()
-    path.write_text(json.dumps(memory, indent=2, ensure_ascii=False), encoding="utf-8")
+    data = _dumps(memory)
+
+    # Write to a sibling temp file and os.replace into place, so a crash
+    # mid-write can never leave a truncated store behind. The payload
+    # goes down in one raw write on the fd — no buffered-layer flushes.
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    _memory_cache = (path.stat().st_mtime_ns, memory)
 
 
 class MemoryInput(BaseModel):
@@ -5,34 +5,96 @@ multi-step tasks across sessions. Stores data in ~/.craftsman/todos.json.
 """
 
 import json
+import os
+import tempfile
 import uuid
+from functools import lru_cache
 from pathlib import Path
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+# orjson fast path with stdlib fallback — same codec helpers as the
+# memory tool.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+
+def _dumps(obj: dict) -> bytes:
+    """Serialize to indented JSON bytes with the fastest available codec."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> dict:
+    """Parse JSON bytes with the fastest available codec."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@lru_cache(maxsize=1)
 def _get_todos_path() -> Path:
-    """Get the path to the todos file."""
+    """Get the path to the todos file (and create its directory once).
+
+    The location is invariant per process, so the Path.home() lookup and
+    the mkdir probe run on the first call only.
+    """
     data_dir = Path.home() / ".agent-cli"
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir / "todos.json"
 
 
+# Parsed todos file, cached per process and invalidated by mtime — same
+# scheme as the memory tool's cache.
+_todos_cache: tuple[int, dict] | None = None
+
+
 def _load_todos() -> dict:
-    """Load todos from file."""
+    """Load todos from file (cached until the file changes on disk)."""
+    global _todos_cache
     path = _get_todos_path()
-    if not path.exists():
+    try:
+        st = path.stat()
+    except FileNotFoundError:
         return {"items": {}}
+
+    if _todos_cache is not None and _todos_cache[0] == st.st_mtime_ns:
+        return _todos_cache[1]
+
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        data = _loads(path.read_bytes())
     except Exception:
         return {"items": {}}
+    _todos_cache = (st.st_mtime_ns, data)
+    return data
 
 
 def _save_todos(todos: dict) -> None:
-    """Save todos to file."""
+    """Save todos to file (atomic temp-file + rename)."""
+    global _todos_cache
     path = _get_todos_path()
-    path.write_text(json.dumps(todos, indent=2, ensure_ascii=False), encoding="utf-8")
+    data = _dumps(todos)
+
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    _todos_cache = (path.stat().st_mtime_ns, todos)
 
 
 class TodoInput(BaseModel):
@@ -3,12 +3,139 @@
 Allows the agent to fetch and read web page content.
 """
 
+import atexit
+import re
+
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
 import httpx
 from bs4 import BeautifulSoup
 
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 cleanly.
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# One pooled client for all fetches. Per-call httpx.get() built and tore
+# down a client each time — a DNS lookup plus TCP and TLS handshakes
+# (~150 ms) per fetch even when hitting the same host repeatedly.
+# Keep-alive connections amortize that, and HTTP/2 (when available)
+# multiplexes concurrent fetches to one origin over a single connection.
+_CLIENT = httpx.Client(
+    http2=_HTTP2,
+    timeout=30,
+    follow_redirects=True,
+    headers={"User-Agent": "Mozilla/5.0 (compatible; agent-cli/1.0)"},
+    limits=httpx.Limits(max_keepalive_connections=20),
+)
+atexit.register(_CLIENT.close)
+
+# Fastest available HTML parser, probed once at import. selectolax
+# (Modest engine, C) parses fastest; lxml (libxml2, C) is the next best
+# backend for BeautifulSoup; the pure-Python html.parser is the last
+# resort. On 100 KB+ pages parsing dominates the whole tool.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+
+# Chrome tags stripped before text extraction, and main-content
+# candidates in priority order. The combined forms let both parser
+# branches collect everything in a single tree traversal instead of one
+# walk per selector.
+# Whitespace cleanup for extracted text, done in one C-level pass: trim
+# each line and drop the newlines that leave blank lines behind. This
+# replaces a per-line strip/filter/join loop that was the hottest Python
+# loop in the tool on large pages.
+_WS_COLLAPSE = re.compile(r"\n[^\S\n]*(?=\n)|^[^\S\n]+|[^\S\n]+$", re.MULTILINE)
+
+# How much of the body to sniff for HTML structure before committing to
+# a DOM build. Real documents show recognizable markup well inside 4 KB.
+_SNIFF_BYTES = 4096
+
+# Markup that identifies a body as HTML. HTML5 allows omitting <html>
+# and <body> entirely, so the sniff also accepts a doctype and the
+# common structural/content tags a valid page or fragment would open with.
+_HTML_SNIFF_RE = re.compile(
+    r"<(?:!doctype\b|html\b|head\b|body\b|title\b|meta\b|link\b|script\b|style\b"
+    r"|div\b|span\b|p\b|a\b|main\b|article\b|section\b|nav\b|h[1-6]\b"
+    r"|ul\b|ol\b|li\b|table\b|form\b|img\b|br\b)",
+    re.IGNORECASE,
+)
+
+_STRIP_TAGS = ["script", "style", "nav", "footer", "header"]
+_STRIP_SELECTOR = ",".join(_STRIP_TAGS)
+_MAIN_SELECTORS = ("main", "article", '[role="main"]', ".content", "#content")
+_MAIN_SELECTOR = ", ".join(_MAIN_SELECTORS)
+
+
+def _main_priority(tag) -> int:
+    """Rank a candidate node by _MAIN_SELECTORS order (lower wins)."""
+    if tag.name == "main":
+        return 0
+    if tag.name == "article":
+        return 1
+    if tag.get("role") == "main":
+        return 2
+    if "content" in (tag.get("class") or []):
+        return 3
+    return 4  # matched #content
+
+def _extract_content(html: str) -> tuple[str, str]:
+    """Extract (title, readable text) from an HTML document.
+
+    Uses selectolax when installed, otherwise BeautifulSoup with the
+    best available backend. Both branches apply the same cleanup: drop
+    chrome tags, prefer a main-content container, fall back to body.
+    """
+    if _SelectolaxParser is not None:
+        tree = _SelectolaxParser(html)
+        title_node = tree.css_first("title")
+        title = title_node.text(strip=True) if title_node else "No title"
+
+        for node in tree.css(_STRIP_SELECTOR):
+            node.decompose()
+
+        main_content = None
+        for selector in _MAIN_SELECTORS:
+            main_content = tree.css_first(selector)
+            if main_content:
+                break
+        if main_content is None:
+            main_content = tree.body or tree.root
+
+        return title, main_content.text(separator="\n", strip=True)
+
+    soup = BeautifulSoup(html, _BS_PARSER)
+
+    # Remove script and style elements (find_all with a name list is a
+    # single traversal)
+    for element in soup(_STRIP_TAGS):
+        element.decompose()
+
+    title = soup.title.string if soup.title else "No title"
+
+    # One combined select() collects every main-content candidate in a
+    # single walk; pick the winner by selector priority, not document
+    # order, so "main" still beats a ".content" div that appears earlier.
+    candidates = soup.select(_MAIN_SELECTOR)
+    main_content = min(candidates, key=_main_priority, default=None)
+
+    if not main_content:
+        main_content = soup.body or soup
+
+    return title, main_content.get_text(separator="\n", strip=True)
+
+
 class WebFetchInput(BaseModel):
     """Input for web_fetch tool."""
     url: str = Field(description="URL to fetch")
@@ -27,11 +154,8 @@ def web_fetch(url: str, max_chars: int = 10000) -> str:
     Useful for reading documentation, articles, or examples.
     """
     try:
-        # Fetch the page
-        headers = {
-            "User-Agent": "Mozilla/5.0 (compatible; agent-cli/1.0)"
-        }
-        response = httpx.get(url, headers=headers, follow_redirects=True, timeout=30)
+        # Fetch the page through the shared pooled client
+        response = _CLIENT.get(url)
         response.raise_for_status()
         
         content_type = response.headers.get("content-type", "")
@@ -42,34 +166,21 @@ def web_fetch(url: str, max_chars: int = 10000) -> str:
         
         if "text/plain" in content_type:
             return f"# Text from {url}:\n\n{response.text[:max_chars]}"
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Remove script and style elements
-        for element in soup(["script", "style", "nav", "footer", "header"]):
-            element.decompose()
-        
-        # Get title
-        title = soup.title.string if soup.title else "No title"
-        
-        # Get main content (try common content containers)
-        main_content = None
-        for selector in ["main", "article", '[role="main"]', ".content", "#content"]:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        if not main_content:
-            main_content = soup.body or soup
-        
-        # Extract text
-        text = main_content.get_text(separator="\n", strip=True)
-        
+
+        # Sniff before parsing: mislabeled JSON, raw text, and other
+        # non-HTML bodies show no recognizable markup in the first few
+        # KB, so skip the DOM build entirely and return them as-is.
+        body = response.text
+        if not _HTML_SNIFF_RE.search(body[:_SNIFF_BYTES]):
+            return f"# Text from {url}:\n\n{body[:max_chars]}"
+
+        # Parse HTML with the fastest available parser
+        title, text = _extract_content(body)
+
         # Clean up whitespace
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
-        text = "\n".join(lines)
-        
+        text = _WS_COLLAPSE.sub("", text).strip("\n")
+
+
         if len(text) > max_chars:
             text = text[:max_chars] + "\n\n[Content truncated...]"
         
@@ -5,11 +5,25 @@ to DuckDuckGo which requires no API key.
 """
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 from exa_py import Exa
 from duckduckgo_search import DDGS
 
+# Worker pool for racing the two search providers. Two workers is
+# exactly one per provider; threads suit the blocking provider clients.
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="web-search")
+
+# One DuckDuckGo session for the whole process. Entering DDGS() as a
+# context manager per call paid a fresh TLS handshake every search;
+# a shared session keeps the connection alive across calls. The client
+# is not thread-safe, so access is serialized with a lock.
+_ddgs = DDGS()
+_DDGS_LOCK = threading.Lock()
+
 class WebSearchInput(BaseModel):
     """Input for web_search tool."""
     query: str = Field(description="Search query")
@@ -54,17 +68,29 @@ def _search_with_exa(query: str, max_results: int, api_key: str) -> tuple[str, b
         return ("", False)  # Signal to fall back to DuckDuckGo
     
 
+def _ddg_text(query: str, max_results: int) -> list:
+    """Run one text search on the shared DDGS session."""
+    return list(_ddgs.text(
+        query,
+        region="wt-wt",
+        safesearch="moderate",
+        max_results=max_results,
+    ))
+
+
 def _search_with_duckduckgo(query: str, max_results: int) -> str:
     """Search using DuckDuckGo (no API key required.)"""
+    global _ddgs
 
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(
-                query,
-                region="wt-wt",
-                safesearch="moderate",
-                max_results=max_results,
-            ))
+        with _DDGS_LOCK:
+            try:
+                results = _ddg_text(query, max_results)
+            except Exception:
+                # A dropped keep-alive connection poisons the session;
+                # rebuild it once and retry before reporting failure.
+                _ddgs = DDGS()
+                results = _ddg_text(query, max_results)
     except Exception as e:
         return f"DuckDuckGo search failed: {e}"
     
@@ -95,15 +121,22 @@ def web_search(query: str, max_results: int = 5) -> str:
 
     Returns search results with titles, URLs, and snippets.
     """
-    # Try Exa first if API key is available
     exa_key = os.environ.get("EXA_API_KEY")
-    if exa_key:
-        result, success = _search_with_exa(query, max_results, exa_key)
-        if success:
-            return result
-        # Exa failed, fall back to DuckDuckGo
-
-    # Fall back to DuckDuckGo (no API key needed)
-    return _search_with_duckduckgo(query, max_results)
+    if not exa_key:
+        return _search_with_duckduckgo(query, max_results)
+
+    # Fire both providers at once. Exa is still preferred when it
+    # succeeds, but the DuckDuckGo fallback is already in flight if it
+    # doesn't — the worst case costs the slower of the two round-trips
+    # instead of their sum.
+    exa_future = _SEARCH_POOL.submit(_search_with_exa, query, max_results, exa_key)
+    ddg_future = _SEARCH_POOL.submit(_search_with_duckduckgo, query, max_results)
+
+    result, success = exa_future.result()
+    if success:
+        ddg_future.cancel()  # Best effort; a started request just gets dropped
+        return result
+
+    return ddg_future.result()
 
     
@@ -27,6 +27,21 @@ class TestToolsCore:
         assert "grep" in tool_names
         assert "glob_files" in tool_names
 
+    def test_run_bash_stdin_command_does_not_poison_session(self):
+        """A stdin-reading command must not break later run_bash calls."""
+        from craftsman.tools.core import run_bash
+
+        # `cat` reads stdin; with the session's stdin redirected from
+        # /dev/null it sees EOF immediately instead of eating the
+        # sentinel line off the shared shell's input.
+        result = run_bash.invoke({"command": "cat"})
+        assert result.startswith("Exit code: 0")
+
+        # The session must still work normally afterwards.
+        result = run_bash.invoke({"command": "echo hello"})
+        assert result.startswith("Exit code: 0")
+        assert "hello" in result
+
 
 class TestAgentConfig:
     """Tests for agent configuration."""
@@ -111,6 +126,80 @@ class TestPermissionSystem:
         assert result == PermissionAction.DENY
 
 
+class TestSafety:
+    """Tests for doom loop detection."""
+
+    def test_check_doom_loop_is_not_a_stub(self):
+        """Guard against a no-op check_doom_loop shadowing the real one."""
+        from craftsman.graph import check_doom_loop
+
+        calls = [{"tool": "read_file", "args": {"path": "a.py"}}] * 3
+        assert check_doom_loop(calls) is True
+        assert check_doom_loop(calls[:2]) is False
+
+
+class TestCompaction:
+    """Tests for context compaction tiers."""
+
+    def test_pruned_outputs_replace_originals_when_merged(self):
+        """Rebuilt tool messages must keep their ids so add_messages replaces them."""
+        from langchain_core.messages import ToolMessage
+        from langgraph.graph.message import add_messages
+        from craftsman.graph.compaction import prune_tool_outputs
+
+        originals = add_messages([], [
+            ToolMessage(content="x" * 4000, tool_call_id=f"call{i}")
+            for i in range(6)
+        ])
+        pruned = prune_tool_outputs(originals, max_token_per_output=100)
+        merged = add_messages(originals, pruned)
+
+        assert len(merged) == len(originals)
+        assert sum(len(m.content) for m in merged) < sum(len(m.content) for m in originals)
+        assert [m.tool_call_id for m in merged] == [m.tool_call_id for m in originals]
+
+    def test_masked_outputs_replace_originals_when_merged(self):
+        """Masked tool messages must also merge as replacements, not appends."""
+        from langchain_core.messages import ToolMessage
+        from langgraph.graph.message import add_messages
+        from craftsman.graph.compaction import mask_old_observations
+
+        originals = add_messages([], [
+            ToolMessage(content="y" * 4000, tool_call_id=f"call{i}")
+            for i in range(6)
+        ])
+        merged = add_messages(originals, mask_old_observations(originals))
+
+        assert len(merged) == len(originals)
+        assert merged[0].content.startswith("[tool output masked")
+
+    def test_summary_tier_removes_dropped_messages(self):
+        """The summary delta must drop old messages, not append alongside them."""
+        from langchain_core.messages import ToolMessage
+        from langgraph.graph.message import add_messages
+        from craftsman.graph.compaction import (
+            _summary_result,
+            RECENT_MESSAGES_TO_KEEP,
+            SUMMARY_MARKER,
+        )
+
+        originals = add_messages([], [
+            ToolMessage(content=f"out{i}", tool_call_id=f"call{i}")
+            for i in range(RECENT_MESSAGES_TO_KEEP + 5)
+        ])
+        recent = originals[-RECENT_MESSAGES_TO_KEEP:]
+        merged = add_messages(originals, _summary_result(originals, recent, "summary"))
+
+        assert len(merged) == RECENT_MESSAGES_TO_KEEP + 1
+        assert "[CONVERSATION SUMMARY]" in merged[0].content
+        assert [m.tool_call_id for m in merged[1:]] == [m.tool_call_id for m in recent]
+
+        # The summary must carry the marker call_model keys off: a summary
+        # at index 0 is a SystemMessage but not the agent's prompt, and
+        # the prompt must still be prepended on subsequent turns.
+        assert merged[0].content.startswith(SUMMARY_MARKER)
+
+
 class TestHooksSystem:
     """Tests for hooks system."""
     